@@ -0,0 +1,41 @@
+"""
+Sample format conversion kernels
+Fused single-pass int16 -> float32 scaling (Numba when available)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _i16_to_f32_kernel(src, dst):
+        for i in prange(src.size):
+            dst[i] = src[i] * (1.0 / 32768.0)
+
+
+def i16_to_f32(src: np.ndarray, dst: np.ndarray = None) -> np.ndarray:
+    """
+    Convert int16 PCM to float32 in [-1, 1) with one read and one write.
+    
+    Args:
+        src: 1-D int16 array
+        dst: Optional preallocated float32 output of the same size
+        
+    Returns:
+        The float32 array
+    """
+    if dst is None:
+        dst = np.empty(src.size, dtype=np.float32)
+    if njit is not None:
+        _i16_to_f32_kernel(src, dst)
+    else:
+        # Writes straight into dst, no float64/float32 temporary
+        np.multiply(src, _INT16_SCALE, out=dst)
+    return dst
@@ -0,0 +1,92 @@
+"""
+Streaming polyphase resampler
+Block-by-block equivalent of scipy.signal.resample_poly with FIR state
+carried across block boundaries.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """
+    Design the anti-aliasing low-pass FIR for an up/down ratio.
+    Same Kaiser design as resample_poly, with the half length rounded up
+    to a multiple of `down` so the group delay is a whole output sample.
+    Cached per ratio; the returned array is shared and read-only.
+    """
+    max_rate = max(up, down)
+    half_len = -(-10 * max_rate // down) * down
+    taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    taps = (taps * up).astype(np.float32)
+    taps.flags.writeable = False
+    return taps
+
+
+class StreamingResampler:
+    """
+    Resample a signal fed in arbitrary-sized blocks.
+    Only the input history needed by the filter is kept between calls,
+    so memory stays O(block) regardless of the total signal length.
+    """
+    
+    def __init__(self, up: int, down: int):
+        """
+        Args:
+            up: Upsampling factor
+            down: Downsampling factor
+        """
+        self.up = up
+        self.down = down
+        self.taps = _polyphase_filter(up, down)
+        self._delay = (self.taps.size - 1) // 2 // down
+        self._buf = np.empty(0, dtype=np.float32)
+        self._buf_start = 0   # global input index of self._buf[0]
+        self._next_out = 0    # next filter output index to emit
+        self._n_in = 0
+        self._n_out = 0
+    
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Feed one mono block; returns the output samples now fully determined"""
+        self._buf = np.concatenate((self._buf, block.astype(np.float32, copy=False)))
+        self._n_in += block.size
+        
+        end = self._buf_start + self._buf.size
+        stop = (end * self.up + self.down - 1) // self.down
+        out = self._emit(stop) if stop > self._next_out else self._buf[:0]
+        
+        # Keep only the inputs still under the filter; the window start must
+        # stay a multiple of `down` so output phases line up between calls
+        first_needed = max(0, -(-(self._next_out * self.down - self.taps.size + 1) // self.up))
+        keep_from = first_needed // self.down * self.down
+        if keep_from > self._buf_start:
+            self._buf = self._buf[keep_from - self._buf_start:]
+            self._buf_start = keep_from
+        return self._cap(out)
+    
+    def flush(self) -> np.ndarray:
+        """Emit the filter tail once the input is exhausted"""
+        return self._cap(self._emit(None))
+    
+    def _emit(self, stop):
+        y = signal.upfirdn(self.taps, self._buf, self.up, self.down)
+        k0 = self._next_out - self._buf_start * self.up // self.down
+        if stop is None:
+            out = y[k0:]
+            stop = self._next_out + out.size
+        else:
+            out = y[k0:k0 + stop - self._next_out]
+        # Drop the filter's group delay at the very start of the stream
+        skip = max(0, self._delay - self._next_out)
+        self._next_out = stop
+        return out[skip:]
+    
+    def _cap(self, out: np.ndarray) -> np.ndarray:
+        # Total output length matches resample_poly: ceil(n_in * up / down)
+        total = -(-self._n_in * self.up // self.down)
+        out = out[:max(0, total - self._n_out)]
+        self._n_out += out.size
+        return out
@@ -6,9 +6,126 @@ Audio Recorder - Capture audio from microphone
 import os
 import tempfile
 import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+from . import _wavwrite
+from ._convert import i16_to_f32
+
+# Seconds of audio the realtime ring buffer can hold before the reader drains it
+RING_SECONDS = 4
+# Minimum number of callback-sized slots in the sounddevice ring buffer
+RING_MIN_BLOCKS = 64
+# Interval (seconds) at which the reader thread drains the ring buffer
+DRAIN_INTERVAL = 0.05
+# Seconds a device listing is reused before PortAudio is queried again
+DEVICE_CACHE_TTL = 2.0
+# Frames per write call when saving recordings to disk
+SAVE_BLOCK_FRAMES = 1 << 16
+
+# Saves recordings off the caller's thread, one file at a time
+_SAVE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-save")
+
+
+def _next_pow2(n: int) -> int:
+    """Smallest power of two >= n (PortAudio ring buffers require it)"""
+    return 1 << max(0, int(n) - 1).bit_length()
+
+
+def _require_soundfile():
+    if sf is None:
+        raise ImportError("soundfile not installed. Install with: pip install soundfile")
+
+
+def _write_recording(audio_data, filename: str, backend: str, sample_rate: int,
+                     channels: int, use_wavwrite: bool) -> str:
+    """Write a finished recording to disk (runs on the _SAVE_POOL thread)"""
+    if use_wavwrite:
+        # WAV payload goes out straight from the array in batched writev calls
+        _wavwrite.write_wav(filename, audio_data, sample_rate, channels)
+    elif backend in ("rtmixer", "sounddevice", "pyaudio"):
+        # libsndfile writes the array directly, converting float32 to PCM_16
+        samples = audio_data.reshape(-1)
+        step = SAVE_BLOCK_FRAMES * channels
+        with sf.SoundFile(filename, mode='w', samplerate=sample_rate,
+                          channels=channels, subtype='PCM_16') as f:
+            for start in range(0, samples.size, step):
+                f.buffer_write(samples[start:start + step], dtype=samples.dtype.name)
+    else:
+        with open(filename, 'wb') as f:
+            f.write(audio_data)
+    return filename
+
+
+class _FrameRing:
+    """
+    Preallocated single-producer/single-consumer ring of float32 frames.
+    The audio callback only writes and the reader thread only reads; each
+    side advances its own index, so no lock or allocation is needed.
+    Mirrors the read side of PortAudio's RingBuffer (read_available/readinto).
+    
+    When `block` is given the buffer is split into that many-frame slots with
+    views created up front, so a full-block write is a single copyto into a
+    prebuilt view and the callback creates no NumPy objects at all.
+    """
+    
+    def __init__(self, frames: int, channels: int, block: Optional[int] = None):
+        self._buf = np.empty((frames, channels), dtype=np.float32)
+        self._size = frames
+        self._write_idx = 0
+        self._read_idx = 0
+        self.overflows = 0
+        if block and frames % block == 0:
+            self._block = block
+            self._slots = [self._buf[i:i + block] for i in range(0, frames, block)]
+        else:
+            self._block = 0
+            self._slots = []
+    
+    @property
+    def read_available(self) -> int:
+        return self._write_idx - self._read_idx
+    
+    def write(self, data) -> int:
+        """Copy `data` into the ring; drops the block if the reader fell behind"""
+        n = len(data)
+        if n > self._size - (self._write_idx - self._read_idx):
+            self.overflows += 1
+            return 0
+        w = self._write_idx % self._size
+        if n == self._block and w % n == 0:
+            np.copyto(self._slots[w // n], data)
+            self._write_idx += n
+            return n
+        first = min(n, self._size - w)
+        np.copyto(self._buf[w:w + first], data[:first])
+        if first < n:
+            np.copyto(self._buf[:n - first], data[first:])
+        # Publish the new write index only after the copy is complete
+        self._write_idx += n
+        return n
+    
+    def readinto(self, out) -> int:
+        """Copy up to len(out) frames into `out`; returns frames read"""
+        n = min(out.shape[0], self._write_idx - self._read_idx)
+        r = self._read_idx % self._size
+        first = min(n, self._size - r)
+        out[:first] = self._buf[r:r + first]
+        if first < n:
+            out[first:n] = self._buf[:n - first]
+        self._read_idx += n
+        return n
+
 
 class AudioRecorder:
     """
@@ -25,16 +142,25 @@ class AudioRecorder:
             sample_rate: Audio sample rate (default 16000 for speech)
             channels: Number of audio channels (1 = mono)
             chunk_size: Buffer size for recording
-            backend: Backend to use - 'pyaudio', 'sounddevice', 'javascript', or 'auto'
+            backend: Backend to use - 'rtmixer', 'pyaudio', 'sounddevice', 'javascript', or 'auto'
         """
         self.sample_rate = sample_rate
         self.channels = channels
         self.chunk_size = chunk_size
         self.backend = backend
-        self.recording = False
+        # One-element list so the RT callback can test it via a bound local
+        self._recording_flag = [False]
         self.frames = []
         self.stream = None
         self._audio = None
+        self._ring = None
+        self._drain_thread = None
+        self._drain_stop = threading.Event()
+        self._sink = None
+        self._sink_frames = 0
+        self._pa_continue = 0
+        self._dev_cache = None
+        self._dev_ts = 0.0
         self._select_backend()
     
     def _select_backend(self):
@@ -42,21 +168,38 @@ class AudioRecorder:
         if self.backend == "auto":
             # Try to find best available backend
             try:
-                import sounddevice
-                self.backend = "sounddevice"
+                import rtmixer
+                self.backend = "rtmixer"
             except ImportError:
                 try:
-                    import pyaudio
-                    self.backend = "pyaudio"
+                    import sounddevice
+                    self.backend = "sounddevice"
                 except ImportError:
-                    self.backend = "javascript"
+                    try:
+                        import pyaudio
+                        self.backend = "pyaudio"
+                    except ImportError:
+                        self.backend = "javascript"
         
         print(f"Using audio backend: {self.backend}")
     
-    def start_recording(self) -> Dict[str, Any]:
+    @property
+    def recording(self) -> bool:
+        return self._recording_flag[0]
+    
+    @recording.setter
+    def recording(self, value: bool):
+        self._recording_flag[0] = value
+    
+    def start_recording(self, filename: Optional[str] = None) -> Dict[str, Any]:
         """
         Start recording audio.
         
+        Args:
+            filename: Optional output file path. With the rtmixer and
+                sounddevice backends, audio is streamed to this file while
+                recording instead of being kept in memory.
+        
         Returns:
             Dictionary with start status
         """
@@ -69,8 +212,16 @@ class AudioRecorder:
         try:
             self.frames = []
             
-            if self.backend == "sounddevice":
-                return self._start_sounddevice()
+            if self.backend in ("rtmixer", "sounddevice"):
+                if filename:
+                    self._open_sink(filename)
+                if self.backend == "rtmixer":
+                    result = self._start_rtmixer()
+                else:
+                    result = self._start_sounddevice()
+                if not result["success"]:
+                    self._close_sink()
+                return result
             elif self.backend == "pyaudio":
                 return self._start_pyaudio()
             elif self.backend == "javascript":
@@ -84,46 +235,150 @@ class AudioRecorder:
                     "error": f"Unsupported backend: {self.backend}"
                 }
         except Exception as e:
+            self._close_sink()
             return {
                 "success": False,
                 "error": f"Error starting recording: {str(e)}"
             }
     
+    def _open_sink(self, filename: str):
+        """Open the output file that the reader thread streams audio into"""
+        _require_soundfile()
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self._sink = sf.SoundFile(filename, mode='w', samplerate=self.sample_rate,
+                                  channels=self.channels, subtype='PCM_16')
+        self._sink_frames = 0
+    
+    def _close_sink(self) -> Optional[str]:
+        """Close the streaming output file; returns its path if one was open"""
+        sink = self._sink
+        if sink is None:
+            return None
+        self._sink = None
+        sink.close()
+        return sink.name
+    
     def _start_sounddevice(self) -> Dict[str, Any]:
         """Start recording using sounddevice"""
         try:
             import sounddevice as sd
-            import numpy as np
             
+            # Whole number of callback-sized slots covering RING_SECONDS
+            nbuf = max(RING_MIN_BLOCKS, -(-self.sample_rate * RING_SECONDS // self.chunk_size))
+            self._ring = _FrameRing(nbuf * self.chunk_size, self.channels, block=self.chunk_size)
             self._audio = sd.InputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 blocksize=self.chunk_size,
-                callback=self._sounddevice_callback
+                dtype='float32',
+                callback=self._make_sounddevice_callback(self._ring)
             )
             self._audio.start()
             self.recording = True
+            self._start_drain_thread()
             
             return {
                 "success": True,
                 "message": "Recording started with sounddevice"
             }
         except Exception as e:
+            # A failed open usually means the device list changed (hotplug)
+            self._dev_cache = None
             return {
                 "success": False,
                 "error": f"sounddevice error: {str(e)}"
             }
     
-    def _sounddevice_callback(self, indata, frames, time, status):
-        """Callback for sounddevice streaming"""
-        if self.recording:
-            self.frames.append(indata.copy())
+    def _start_rtmixer(self) -> Dict[str, Any]:
+        """
+        Start recording using rtmixer.
+        The PortAudio callback is implemented in C and writes straight into a
+        ring buffer without taking the GIL; a reader thread drains it.
+        """
+        try:
+            import rtmixer
+            
+            self._ring = rtmixer.RingBuffer(
+                elementsize=self.channels * 4,  # float32 per channel
+                size=_next_pow2(self.sample_rate * RING_SECONDS)
+            )
+            self._audio = rtmixer.Recorder(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                blocksize=self.chunk_size,
+                dtype='float32'
+            )
+            self._audio.start()
+            self._audio.record_ringbuffer(self._ring)
+            self.recording = True
+            self._start_drain_thread()
+            
+            return {
+                "success": True,
+                "message": "Recording started with rtmixer"
+            }
+        except Exception as e:
+            self._dev_cache = None
+            return {
+                "success": False,
+                "error": f"rtmixer error: {str(e)}"
+            }
+    
+    def _start_drain_thread(self):
+        """Start the background reader that empties the ring buffer"""
+        self._drain_stop.clear()
+        self._drain_thread = threading.Thread(target=self._drain_loop, daemon=True)
+        self._drain_thread.start()
+    
+    def _stop_drain_thread(self):
+        """Stop the reader thread and collect whatever is left in the ring"""
+        if self._drain_thread is not None:
+            self._drain_stop.set()
+            self._drain_thread.join()
+            self._drain_thread = None
+        self._drain_ring()
+        self._ring = None
+    
+    def _drain_loop(self):
+        """Periodically move audio from the ring buffer into self.frames (or the sink)"""
+        while not self._drain_stop.wait(DRAIN_INTERVAL):
+            self._drain_ring()
+    
+    def _drain_ring(self):
+        """Read all available frames from the ring buffer in one copy"""
+        ring = self._ring
+        if ring is None:
+            return
+        available = ring.read_available
+        if not available:
+            return
+        block = np.empty((available, self.channels), dtype=np.float32)
+        read = ring.readinto(block)
+        if self._sink is not None:
+            # Streaming mode: memory stays bounded by one drain interval
+            self._sink.buffer_write(block[:read], dtype='float32')
+            self._sink_frames += read
+        else:
+            self.frames.append(block[:read])
+    
+    def _make_sounddevice_callback(self, ring: _FrameRing):
+        """
+        Build the sounddevice callback (copies into the ring, no allocation).
+        The flag and ring.write are bound as default arguments, so the RT
+        thread does fast local loads instead of attribute lookups on self.
+        """
+        def callback(indata, frames, time, status,
+                     _flag=self._recording_flag, _write=ring.write):
+            if _flag[0]:
+                _write(indata)
+        return callback
     
     def _start_pyaudio(self) -> Dict[str, Any]:
         """Start recording using pyaudio"""
         try:
             import pyaudio
             
+            self._pa_continue = pyaudio.paContinue
             self._audio = pyaudio.PyAudio()
             self.stream = self._audio.open(
                 format=pyaudio.paInt16,
@@ -141,6 +396,7 @@ class AudioRecorder:
                 "message": "Recording started with pyaudio"
             }
         except Exception as e:
+            self._dev_cache = None
             return {
                 "success": False,
                 "error": f"pyaudio error: {str(e)}"
@@ -150,7 +406,7 @@ class AudioRecorder:
         """Callback for pyaudio streaming"""
         if self.recording:
             self.frames.append(in_data)
-        return (in_data, pyaudio.paContinue)
+        return (None, self._pa_continue)
     
     def stop_recording(self, filename: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -160,7 +416,9 @@ class AudioRecorder:
             filename: Optional output file path
             
         Returns:
-            Dictionary with recording data or file path
+            Dictionary with recording data or file path. A file saved after
+            recording carries a "write" Future; wait on it before reading
+            the file.
         """
         if not self.recording:
             return {
@@ -172,17 +430,31 @@ class AudioRecorder:
             self.recording = False
             
             # Stop audio streams
-            if self.backend == "sounddevice" and self._audio:
+            if self.backend == "rtmixer" and self._audio:
                 self._audio.stop()
                 self._audio.close()
+                self._stop_drain_thread()
+            elif self.backend == "sounddevice" and self._audio:
+                self._audio.stop()
+                self._audio.close()
+                self._stop_drain_thread()
             elif self.backend == "pyaudio" and self.stream:
                 self.stream.stop_stream()
                 self.stream.close()
                 if self._audio:
                     self._audio.terminate()
             
-            # Process recorded audio
-            audio_data = self._process_frames()
+            # Audio was already streamed to disk during recording
+            streamed_file = self._close_sink()
+            if streamed_file:
+                return {
+                    "success": True,
+                    "filename": streamed_file,
+                    "duration": self._sink_frames / self.sample_rate
+                }
+            
+            # Process recorded audio (pyaudio keeps int16 when saving to file)
+            audio_data = self._process_frames(as_float=not filename)
             
             if filename:
                 return self._save_to_file(audio_data, filename)
@@ -199,24 +471,42 @@ class AudioRecorder:
                 "error": f"Error stopping recording: {str(e)}"
             }
     
-    def _process_frames(self):
-        """Process recorded frames into audio array"""
+    def _process_frames(self, as_float: bool = True):
+        """
+        Process recorded frames into audio array.
+        
+        Args:
+            as_float: Convert pyaudio int16 samples to float32 in [-1, 1)
+        """
         try:
-            import numpy as np
-            
-            if self.backend == "sounddevice":
-                import numpy as np
-                return np.concatenate(self.frames) if self.frames else np.array([])
-            elif self.backend == "pyaudio":
-                import wave
-                import io
-                
-                # Combine frames
-                audio_bytes = b''.join(self.frames)
+            if self.backend in ("rtmixer", "sounddevice"):
+                if not self.frames:
+                    return np.array([])
                 
-                # Convert to numpy array
-                audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
-                return audio_array.astype(np.float32) / 32768.0
+                # Copy each block straight into a preallocated output
+                total = sum(f.shape[0] for f in self.frames)
+                out = np.empty((total, self.channels), dtype=self.frames[0].dtype)
+                offset = 0
+                for f in self.frames:
+                    n = f.shape[0]
+                    out[offset:offset + n] = f
+                    offset += n
+                self.frames = []
+                return out
+            elif self.backend == "pyaudio":
+                # Copy raw chunks into one bytearray, then view it as int16
+                total = sum(map(len, self.frames))
+                buf = bytearray(total)
+                mv = memoryview(buf)
+                offset = 0
+                for chunk in self.frames:
+                    n = len(chunk)
+                    mv[offset:offset + n] = chunk
+                    offset += n
+                self.frames = []
+                # frombuffer shares storage with the bytearray (no copy)
+                pcm = np.frombuffer(buf, dtype=np.int16)
+                return i16_to_f32(pcm) if as_float else pcm
             else:
                 return b''.join(self.frames)
         except Exception as e:
@@ -224,32 +514,27 @@ class AudioRecorder:
             return b''
     
     def _save_to_file(self, audio_data, filename: str) -> Dict[str, Any]:
-        """Save audio data to file"""
+        """
+        Save audio data to file on the background writer thread.
+        Returns at once; result["write"] is a Future that resolves to the
+        filename when the file is complete, or raises if the write failed.
+        """
         try:
-            import numpy as np
-            
             # Ensure directory exists
             os.makedirs(os.path.dirname(filename), exist_ok=True)
             
-            if self.backend == "sounddevice":
-                import soundfile as sf
-                sf.write(filename, audio_data, self.sample_rate)
-            elif self.backend == "pyaudio":
-                import wave
-                
-                with wave.open(filename, 'wb') as wf:
-                    wf.setnchannels(self.channels)
-                    wf.setsampwidth(2)  # 16-bit
-                    wf.setframerate(self.sample_rate)
-                    wf.writeframes(audio_data.tobytes())
-            else:
-                with open(filename, 'wb') as f:
-                    f.write(audio_data)
+            use_wavwrite = (self.backend in ("rtmixer", "sounddevice", "pyaudio")
+                            and filename.lower().endswith('.wav') and _wavwrite.supported(audio_data))
+            if not use_wavwrite and self.backend in ("rtmixer", "sounddevice", "pyaudio"):
+                _require_soundfile()
             
+            write = _SAVE_POOL.submit(_write_recording, audio_data, filename, self.backend,
+                                      self.sample_rate, self.channels, use_wavwrite)
             return {
                 "success": True,
                 "filename": filename,
-                "duration": len(audio_data) / self.sample_rate if hasattr(audio_data, '__len__') else 0
+                "duration": len(audio_data) / self.sample_rate if hasattr(audio_data, '__len__') else 0,
+                "write": write
             }
         except Exception as e:
             return {
@@ -260,23 +545,32 @@ class AudioRecorder:
     def get_devices(self) -> List[Dict[str, Any]]:
         """
         Get list of available audio input devices.
+        The listing is cached for DEVICE_CACHE_TTL seconds, since it only
+        changes on hotplug; a failed stream open drops the cache.
         
         Returns:
             List of device dictionaries
         """
+        now = time.monotonic()
+        if self._dev_cache is not None and now - self._dev_ts < DEVICE_CACHE_TTL:
+            # Fresh dicts, so a caller editing an entry can't corrupt the cache
+            return [dict(d) for d in self._dev_cache]
+        
         devices = []
         
         try:
-            if self.backend == "sounddevice":
+            if self.backend in ("rtmixer", "sounddevice"):
                 import sounddevice as sd
-                for i, dev in enumerate(sd.query_devices()):
-                    if dev['max_input_channels'] > 0:
-                        devices.append({
-                            "index": i,
-                            "name": dev['name'],
-                            "channels": dev['max_input_channels'],
-                            "sample_rate": dev['default_samplerate']
-                        })
+                devices = [
+                    {
+                        "index": i,
+                        "name": dev['name'],
+                        "channels": dev['max_input_channels'],
+                        "sample_rate": dev['default_samplerate']
+                    }
+                    for i, dev in enumerate(sd.query_devices())
+                    if dev['max_input_channels'] > 0
+                ]
             elif self.backend == "pyaudio":
                 import pyaudio
                 p = pyaudio.PyAudio()
@@ -292,8 +586,11 @@ class AudioRecorder:
                 p.terminate()
         except Exception as e:
             print(f"Error getting devices: {e}")
+            return devices
         
-        return devices
+        self._dev_cache = tuple(devices)
+        self._dev_ts = now
+        return [dict(d) for d in devices]
     
     def is_recording(self) -> bool:
         """Check if currently recording"""
@@ -306,11 +603,14 @@ class AudioRecorder:
 
 # Singleton instance
 _audio_recorder: Optional[AudioRecorder] = None
+_audio_recorder_lock = threading.Lock()
 
 
 def get_audio_recorder(**kwargs) -> AudioRecorder:
-    """Get or create audio recorder singleton"""
+    """Get or create audio recorder singleton (thread-safe)"""
     global _audio_recorder
     if _audio_recorder is None:
-        _audio_recorder = AudioRecorder(**kwargs)
+        with _audio_recorder_lock:
+            if _audio_recorder is None:
+                _audio_recorder = AudioRecorder(**kwargs)
     return _audio_recorder
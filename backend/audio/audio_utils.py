@@ -3,11 +3,26 @@ Audio Utilities - Helper functions for audio processing
 """
 
 import os
+import mmap
 import tempfile
 import hashlib
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Files above this size are hashed by BLAKE3 via mmap on all cores
+BLAKE3_MMAP_THRESHOLD = 16 * 1024 * 1024
+# Frames per block when streaming audio through convert_audio
+CONVERT_BLOCK_SIZE = 1 << 16
+# Extensions removed by cleanup_temp_audio
+TEMP_AUDIO_SUFFIXES = ('.wav', '.mp3', '.ogg', '.flac')
+
+_TEMP_DIR = tempfile.gettempdir()
+
 
 class AudioUtils:
     """Utility class for audio file operations"""
@@ -127,34 +142,38 @@ class AudioUtils:
             Dictionary with conversion result
         """
         try:
+            import numpy as np
             import soundfile as sf
+            from math import gcd
+            from ._resample import StreamingResampler
             
-            # Read audio
-            data, sr = sf.read(input_path)
-            
-            # Resample if needed
-            if sr != sample_rate:
-                import numpy as np
-                from scipy import signal
+            # Stream block by block: peak memory is O(block), not O(file)
+            with sf.SoundFile(input_path) as src:
+                resampler = None
+                if src.samplerate != sample_rate:
+                    g = gcd(sample_rate, src.samplerate)
+                    resampler = StreamingResampler(sample_rate // g, src.samplerate // g)
                 
-                # Calculate new length
-                new_length = int(len(data) * sample_rate / sr)
-                data = signal.resample(data, new_length)
-                sr = sample_rate
-            
-            # Ensure mono if needed
-            if len(data.shape) > 1:
-                data = data.mean(axis=1)
-            
-            # Write output
-            sf.write(output_path, data, sr)
+                # Read and mono-mix buffers are allocated once and reused per block
+                frames = np.empty((CONVERT_BLOCK_SIZE, src.channels), dtype=np.float32)
+                mix = np.empty(CONVERT_BLOCK_SIZE, dtype=np.float32)
+                
+                with sf.SoundFile(output_path, 'w', samplerate=sample_rate, channels=1) as dst:
+                    for block in src.blocks(dtype='float32', always_2d=True, out=frames):
+                        if src.channels == 1:
+                            mono = block[:, 0]
+                        else:
+                            mono = np.mean(block, axis=1, out=mix[:len(block)])
+                        dst.write(resampler.process(mono) if resampler else mono)
+                    if resampler:
+                        dst.write(resampler.flush())
             
             return {
                 "success": True,
                 "input": input_path,
                 "output": output_path,
                 "format": format,
-                "sample_rate": sr
+                "sample_rate": sample_rate
             }
         except ImportError:
             return {
@@ -187,20 +206,33 @@ class AudioUtils:
     @staticmethod
     def calculate_audio_hash(filepath: str) -> str:
         """
-        Calculate MD5 hash of audio file.
+        Calculate content hash of audio file.
+        Uses BLAKE3 when installed (SIMD, multithreaded for large files),
+        otherwise BLAKE2b. The hash is only used for content addressing.
         
         Args:
             filepath: Path to audio file
             
         Returns:
-            MD5 hash string
+            Hex digest string
         """
-        hash_md5 = hashlib.md5()
         try:
+            if blake3 is not None and os.path.getsize(filepath) > BLAKE3_MMAP_THRESHOLD:
+                hasher = blake3(max_threads=blake3.AUTO)
+                hasher.update_mmap(filepath)
+                return hasher.hexdigest()
+            
+            hasher = blake3() if blake3 is not None else hashlib.blake2b()
             with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    return hasher.hexdigest()
+                # Hash straight out of the page cache, no user-space copies
+                with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    hasher.update(mm)
+            return hasher.hexdigest()
         except Exception as e:
             return f"error: {str(e)}"
     
@@ -220,17 +252,18 @@ class AudioUtils:
         Returns:
             Number of files deleted
         """
-        temp_dir = tempfile.gettempdir()
         deleted = 0
         
         try:
-            for filename in os.listdir(temp_dir):
-                if filename.startswith(prefix) and filename.endswith(('.wav', '.mp3', '.ogg', '.flac')):
-                    filepath = os.path.join(temp_dir, filename)
+            with os.scandir(_TEMP_DIR) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.startswith(prefix) or not name.endswith(TEMP_AUDIO_SUFFIXES):
+                        continue
                     try:
-                        os.unlink(filepath)
+                        os.unlink(entry.path)
                         deleted += 1
-                    except Exception:
+                    except OSError:
                         pass
         except Exception:
             pass
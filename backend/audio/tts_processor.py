@@ -4,25 +4,85 @@ TTS Processor - Text-to-Speech using pyttsx3
 """
 
 import os
+import re
+import queue
 import tempfile
 import platform
+import threading
 from typing import Dict, Any, Optional, List
 
+_WORD_RE = re.compile(r'\S+')
+
 
 class TTSProcessor:
     """
     Text-to-Speech processor using pyttsx3 for offline synthesis.
     Uses native system voices (SAPI5 on Windows, NSSpeechSynthesizer on macOS, espeak on Linux).
+    
+    pyttsx3 engines are not thread-safe, so a single worker thread owns the
+    engine for its whole life; every engine call is posted to its queue.
     """
     
     def __init__(self):
-        """Initialize TTS engine"""
+        """Initialize TTS engine on the worker thread"""
         self.engine = None
         self.voices = []
         self.default_voice = None
         self.default_rate = 150  # words per minute
         self.default_volume = 1.0
+        self._sec_per_word = 60.0 / self.default_rate
+        self._queue = queue.SimpleQueue()
+        self._ready = threading.Event()
+        self._worker = threading.Thread(target=self._pump, daemon=True)
+        self._worker.start()
+        self._ready.wait()
+    
+    def _pump(self):
+        """Worker loop: create the engine, then run queued engine calls"""
         self._initialize_engine()
+        self._ready.set()
+        if self.engine is None:
+            return
+        
+        while True:
+            func, args, done, box = self._queue.get()
+            try:
+                box["result"] = func(*args)
+            except Exception as e:
+                box["error"] = e
+                if done is None:
+                    print(f"TTS worker error: {e}")
+            finally:
+                if done is not None:
+                    done.set()
+    
+    def _call(self, func, *args, wait: bool = True):
+        """
+        Run `func(*args)` on the engine thread.
+        
+        Args:
+            func: Callable touching the engine
+            wait: If True, block until it finishes and return its result
+        """
+        if not wait:
+            self._queue.put((func, args, None, {}))
+            return None
+        
+        done = threading.Event()
+        box = {}
+        self._queue.put((func, args, done, box))
+        done.wait()
+        if "error" in box:
+            raise box["error"]
+        return box.get("result")
+    
+    def _say(self, text: str):
+        self.engine.say(text)
+        self.engine.runAndWait()
+    
+    def _save(self, text: str, filename: str):
+        self.engine.save_to_file(text, filename)
+        self.engine.runAndWait()
     
     def _initialize_engine(self):
         """Initialize pyttsx3 engine"""
@@ -67,7 +127,7 @@ class TTSProcessor:
         try:
             voice_ids = [v.id for v in self.voices]
             if voice_id in voice_ids:
-                self.engine.setProperty('voice', voice_id)
+                self._call(self.engine.setProperty, 'voice', voice_id)
                 return True
             return False
         except Exception as e:
@@ -85,8 +145,9 @@ class TTSProcessor:
             return
         
         try:
-            self.engine.setProperty('rate', rate)
+            self._call(self.engine.setProperty, 'rate', rate)
             self.default_rate = rate
+            self._sec_per_word = 60.0 / rate
         except Exception as e:
             print(f"Error setting rate: {e}")
     
@@ -102,7 +163,7 @@ class TTSProcessor:
         
         try:
             volume = max(0.0, min(1.0, volume))
-            self.engine.setProperty('volume', volume)
+            self._call(self.engine.setProperty, 'volume', volume)
             self.default_volume = volume
         except Exception as e:
             print(f"Error setting volume: {e}")
@@ -126,15 +187,14 @@ class TTSProcessor:
         
         try:
             if blocking:
-                self.engine.say(text)
-                self.engine.runAndWait()
+                self._call(self._say, text)
                 return {
                     "success": True,
                     "text": text,
                     "duration": self._estimate_duration(text)
                 }
             else:
-                self.engine.say(text)
+                self._call(self._say, text, wait=False)
                 return {
                     "success": True,
                     "text": text,
@@ -176,8 +236,7 @@ class TTSProcessor:
                 filename = os.path.join(temp_dir, "tts_output.mp3")
             
             # Save to file
-            self.engine.save_to_file(text, filename)
-            self.engine.runAndWait()
+            self._call(self._save, text, filename)
             
             return {
                 "success": True,
@@ -196,6 +255,7 @@ class TTSProcessor:
             return
         
         try:
+            # Called directly: a queued stop would wait behind the speech it should halt
             self.engine.stop()
         except Exception as e:
             print(f"Error stopping: {e}")
@@ -219,8 +279,8 @@ class TTSProcessor:
     
     def _estimate_duration(self, text: str) -> float:
         """Estimate speech duration in seconds"""
-        words = len(text.split())
-        return (words / self.default_rate) * 60
+        words = sum(1 for _ in _WORD_RE.finditer(text))
+        return words * self._sec_per_word
     
     def is_available(self) -> bool:
         """Check if TTS engine is available"""
@@ -229,13 +289,16 @@ class TTSProcessor:
 
 # Singleton instance
 _tts_processor: Optional[TTSProcessor] = None
+_tts_processor_lock = threading.Lock()
 
 
 def get_tts_processor() -> TTSProcessor:
-    """Get or create TTS processor singleton"""
+    """Get or create TTS processor singleton (thread-safe)"""
     global _tts_processor
     if _tts_processor is None:
-        _tts_processor = TTSProcessor()
+        with _tts_processor_lock:
+            if _tts_processor is None:
+                _tts_processor = TTSProcessor()
     return _tts_processor
 
 
@@ -1,13 +1,59 @@
 """
-Whisper Processor - Speech-to-Text using OpenAI Whisper
+Whisper Processor - Speech-to-Text using Whisper models
+Runs on faster-whisper (CTranslate2) when available, falling back to openai-whisper
 100% offline processing
 """
 
+import asyncio
+import bisect
+import gc
 import os
-import tempfile
-from typing import Dict, Any, Optional
+import sys
+import threading
+from math import gcd
+from typing import Dict, Any, Optional, Tuple, List
 from pathlib import Path
 
+try:
+    import numpy as np
+    from ._convert import i16_to_f32
+except ImportError:
+    np = None
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:
+    resample_poly = None
+
+# openai-whisper and torch are bound by _load_model only when that backend is
+# selected, so faster-whisper deployments never import torch
+_whisper = None
+_torch = None
+
+# Sample rate Whisper models expect for in-memory audio
+WHISPER_SAMPLE_RATE = 16000
+
+_AVAILABLE_MODELS = ("tiny", "base", "small", "medium", "large", "large-v2", "large-v3")
+
+# Silence shorter than this is kept when VAD trims non-speech
+VAD_MIN_SILENCE_MS = 500
+
+# Micro-batching of concurrent requests (openai-whisper on CUDA only)
+BATCH_WINDOW = 0.03   # seconds to wait for more requests after the first
+MAX_BATCH = 8
+
+# Seconds per openai-whisper timestamp token
+TIMESTAMP_PRECISION = 0.02
+
+
+def _segment_columns(starts: List[float], ends: List[float], texts: List[str]) -> Dict[str, list]:
+    """Segments as parallel columns instead of one dict per segment"""
+    return {
+        "segments_start": starts,
+        "segments_end": ends,
+        "segments_text": texts
+    }
+
 
 class WhisperProcessor:
     """
@@ -17,7 +63,7 @@ class WhisperProcessor:
     
     def __init__(self, model_name: str = "base", device: str = "cpu"):
         """
-        Initialize Whisper processor.
+        Initialize Whisper processor. The model itself is loaded on first use.
         
         Args:
             model_name: Model size - tiny, base, small, medium, large
@@ -26,21 +72,86 @@ class WhisperProcessor:
         self.model_name = model_name
         self.device = device
         self.model = None
-        self._load_model()
+        self.backend = None
+        self._load_attempted = False
+        self._load_lock = threading.Lock()
+        # openai-whisper's decoder (KV-cache hooks, CUDA graphs) is not
+        # re-entrant; faster-whisper handles concurrent calls itself
+        self._infer_lock = threading.Lock()
+        self._batcher = None
+        self._vad = None
+    
+    def ensure_loaded(self) -> bool:
+        """Load the model once, on first use; returns True if it is available"""
+        if self.model is None and not self._load_attempted:
+            with self._load_lock:
+                if self.model is None and not self._load_attempted:
+                    self._load_model()
+                    self._load_attempted = True
+        return self.model is not None
+    
+    def unload(self):
+        """Drop the model and release its memory (including cached CUDA blocks)"""
+        with self._load_lock:
+            self.model = None
+            self._load_attempted = False
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and self.device == "cuda" and torch.cuda.is_available():
+            torch.cuda.empty_cache()
     
     def _load_model(self):
-        """Load Whisper model (lazy loading)"""
+        """Load Whisper model, preferring faster-whisper (CTranslate2)"""
+        try:
+            from faster_whisper import WhisperModel
+            compute_type = "int8_float16" if self.device == "cuda" else "int8"
+            self.model = WhisperModel(self.model_name, device=self.device, compute_type=compute_type)
+            self.backend = "faster-whisper"
+            print(f"Whisper model '{self.model_name}' loaded with faster-whisper on {self.device} ({compute_type})")
+            return
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"Error loading faster-whisper model, trying openai-whisper: {e}")
+        
         try:
+            global _whisper, _torch
             import whisper
+            import torch
+            _whisper, _torch = whisper, torch
             self.model = whisper.load_model(self.model_name, device=self.device)
+            self.backend = "openai-whisper"
+            if self.device == "cuda":
+                self._compile_model()
             print(f"Whisper model '{self.model_name}' loaded successfully on {self.device}")
         except ImportError:
-            print("Whisper not installed. Install with: pip install openai-whisper")
+            print("Whisper not installed. Install with: pip install faster-whisper")
             self.model = None
         except Exception as e:
             print(f"Error loading Whisper model: {e}")
             self.model = None
     
+    def _compile_model(self):
+        """
+        torch.compile the openai-whisper encoder/decoder (CUDA only) and warm
+        them up on 30 s of silence, so the first request doesn't pay for
+        compilation. Falls back to the eager modules if compilation fails.
+        """
+        if not hasattr(_torch, "compile"):
+            return
+        
+        encoder, decoder = self.model.encoder, self.model.decoder
+        with self._infer_lock:
+            try:
+                self.model.encoder = _torch.compile(encoder, mode="max-autotune")
+                # Fixed shapes let the per-token decode step be captured as a CUDA graph
+                self.model.decoder = _torch.compile(decoder, mode="reduce-overhead", dynamic=False)
+                silence = np.zeros(_whisper.audio.N_SAMPLES, dtype=np.float32)
+                self.model.transcribe(silence, fp16=True, verbose=None)
+            except Exception as e:
+                print(f"torch.compile failed for Whisper, using eager mode: {e}")
+                self.model.encoder, self.model.decoder = encoder, decoder
+    
     def transcribe_audio(self, audio_path: str, language: Optional[str] = None, 
                         task: str = "transcribe") -> Dict[str, Any]:
         """
@@ -54,32 +165,14 @@ class WhisperProcessor:
         Returns:
             Dictionary with transcription results
         """
-        if self.model is None:
+        if not self.ensure_loaded():
             return {
                 "success": False,
-                "error": "Whisper model not loaded. Please install whisper: pip install openai-whisper"
+                "error": "Whisper model not loaded. Please install whisper: pip install faster-whisper"
             }
         
         try:
-            # Prepare transcription options
-            options = {
-                "verbose": False,
-                "task": task,
-            }
-            
-            if language:
-                options["language"] = language
-            
-            # Perform transcription
-            result = self.model.transcribe(audio_path, **options)
-            
-            return {
-                "success": True,
-                "text": result["text"].strip(),
-                "segments": result.get("segments", []),
-                "language": result.get("language", language or "auto"),
-                "duration": result.get("duration", 0)
-            }
+            return self._transcribe(audio_path, language, task)
             
         except FileNotFoundError:
             return {
@@ -92,45 +185,214 @@ class WhisperProcessor:
                 "error": f"Transcription error: {str(e)}"
             }
     
+    async def transcribe_audio_async(self, audio_path: str, language: Optional[str] = None,
+                                     task: str = "transcribe") -> Dict[str, Any]:
+        """
+        Transcribe from async code without blocking the event loop.
+        With openai-whisper on CUDA, concurrent short clips are coalesced
+        into one batched GPU decode; otherwise each call runs in a thread
+        (serialised per model on openai-whisper, concurrent on faster-whisper).
+        
+        Args:
+            audio_path: Path to audio file
+            language: Language code or None for auto-detect
+            task: 'transcribe' or 'translate'
+            
+        Returns:
+            Dictionary with transcription results
+        """
+        if not await asyncio.to_thread(self.ensure_loaded):
+            return await asyncio.to_thread(self.transcribe_audio, audio_path, language, task)
+        
+        if self.backend == "openai-whisper" and self.device == "cuda":
+            if self._batcher is None:
+                self._batcher = BatchedTranscriber(self)
+            return await self._batcher.transcribe(audio_path, language, task)
+        
+        return await asyncio.to_thread(self.transcribe_audio, audio_path, language, task)
+    
+    def _transcribe(self, audio, language: Optional[str], task: str) -> Dict[str, Any]:
+        """
+        Run the loaded backend on a file path or a float32 16 kHz mono array.
+        """
+        if self.backend == "faster-whisper":
+            return self._transcribe_faster(audio, language, task)
+        with self._infer_lock:
+            return self._transcribe_openai(audio, language, task)
+    
+    def _transcribe_openai(self, audio, language: Optional[str], task: str) -> Dict[str, Any]:
+        """openai-whisper path of _transcribe; the caller holds _infer_lock"""
+        # Prepare transcription options
+        options = {
+            "verbose": False,
+            "task": task,
+            "fp16": self.device == "cuda",
+        }
+        
+        if language:
+            options["language"] = language
+        
+        if isinstance(audio, str):
+            audio = _whisper.load_audio(audio)
+        duration = audio.shape[0] / WHISPER_SAMPLE_RATE
+        
+        # Only speech reaches the encoder
+        audio, offsets = self._speech_only(audio)
+        if audio.shape[0] == 0:
+            return {
+                "success": True,
+                "text": "",
+                **_segment_columns([], [], []),
+                "language": language or "auto",
+                "duration": duration
+            }
+        
+        if self.device == "cuda":
+            audio = self._to_device(audio)
+        
+        # Perform transcription (no autograd bookkeeping; fp16 autocast on CUDA)
+        with _torch.inference_mode(), _torch.autocast(
+            device_type="cuda" if self.device == "cuda" else "cpu",
+            dtype=_torch.float16,
+            enabled=self.device == "cuda"
+        ):
+            result = self.model.transcribe(audio, **options)
+        segments = result.get("segments", [])
+        starts = [seg["start"] for seg in segments]
+        ends = [seg["end"] for seg in segments]
+        if offsets:
+            starts = self._restore_times(starts, offsets, bisect.bisect_right)
+            # A segment end on a chunk boundary belongs to the chunk before it
+            ends = self._restore_times(ends, offsets, bisect.bisect_left)
+        
+        return {
+            "success": True,
+            "text": result["text"].strip(),
+            **_segment_columns(starts, ends, [seg["text"] for seg in segments]),
+            "language": result.get("language", language or "auto"),
+            "duration": duration
+        }
+    
+    def _speech_only(self, audio):
+        """
+        Drop non-speech with Silero VAD (silero-vad package, bundled model).
+        
+        Returns:
+            (speech audio, [(trimmed offset s, original offset s), ...]), or
+            the input unchanged with None when the VAD is not installed
+        """
+        if self._vad is None:
+            try:
+                from silero_vad import load_silero_vad, get_speech_timestamps
+                self._vad = (load_silero_vad(), get_speech_timestamps)
+            except ImportError:
+                self._vad = False
+        if self._vad is False:
+            return audio, None
+        
+        vad_model, get_speech_timestamps = self._vad
+        stamps = get_speech_timestamps(
+            _torch.from_numpy(audio), vad_model,
+            sampling_rate=WHISPER_SAMPLE_RATE,
+            min_silence_duration_ms=VAD_MIN_SILENCE_MS
+        )
+        if not stamps:
+            return audio[:0], []
+        
+        pieces, offsets, trimmed = [], [], 0
+        for ts in stamps:
+            offsets.append((trimmed / WHISPER_SAMPLE_RATE, ts["start"] / WHISPER_SAMPLE_RATE))
+            pieces.append(audio[ts["start"]:ts["end"]])
+            trimmed += ts["end"] - ts["start"]
+        return np.concatenate(pieces), offsets
+    
+    @staticmethod
+    def _restore_times(times: List[float], offsets: List[Tuple[float, float]], search) -> List[float]:
+        """Map times on the VAD-trimmed audio back to the original timeline"""
+        chunk_starts = [trimmed for trimmed, _ in offsets]
+        restored = []
+        for t in times:
+            trimmed, original = offsets[max(0, search(chunk_starts, t) - 1)]
+            restored.append(t - trimmed + original)
+        return restored
+    
+    def _to_device(self, audio):
+        """
+        Upload the waveform to the GPU in one copy. openai-whisper then builds
+        the whole log-mel on the device instead of moving every 30 s window
+        from host memory during decoding.
+        """
+        if isinstance(audio, str):
+            audio = _whisper.load_audio(audio)
+        return _torch.from_numpy(audio).to(self.device)
+    
+    def _transcribe_faster(self, audio, language: Optional[str], task: str) -> Dict[str, Any]:
+        """Transcribe with faster-whisper and map the result to the common result dict"""
+        segments, info = self.model.transcribe(
+            audio,
+            language=language,
+            task=task,
+            beam_size=1,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=VAD_MIN_SILENCE_MS)
+        )
+        # segments is a lazy generator; decoding happens while iterating
+        starts, ends, texts = [], [], []
+        for seg in segments:
+            starts.append(seg.start)
+            ends.append(seg.end)
+            texts.append(seg.text)
+        return {
+            "success": True,
+            "text": "".join(texts).strip(),
+            **_segment_columns(starts, ends, texts),
+            "language": info.language or language or "auto",
+            "duration": info.duration
+        }
+    
     def transcribe_audio_data(self, audio_data: bytes, sample_rate: int = 16000,
-                             language: Optional[str] = None) -> Dict[str, Any]:
+                             language: Optional[str] = None,
+                             dtype: str = "int16") -> Dict[str, Any]:
         """
         Transcribe raw audio data.
         
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Raw mono PCM bytes
             sample_rate: Audio sample rate
             language: Language code or None for auto-detect
+            dtype: Sample format of audio_data - 'int16' (microphone PCM) or 'float32'
             
         Returns:
             Dictionary with transcription results
         """
-        if self.model is None:
+        if not self.ensure_loaded():
             return {
                 "success": False,
                 "error": "Whisper model not loaded"
             }
         
         try:
-            import numpy as np
-            import io
-            import soundfile as sf
-            
-            # Convert bytes to numpy array
-            audio_array = np.frombuffer(audio_data, dtype=np.float32)
+            if np is None:
+                raise ImportError("numpy not installed. Install with: pip install numpy")
             
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                sf.write(tmp.name, audio_array, sample_rate)
-                tmp_path = tmp.name
+            # View the bytes as samples (no copy); int16 is scaled to [-1, 1) in one pass
+            if dtype == "int16":
+                audio_array = i16_to_f32(np.frombuffer(audio_data, dtype=np.int16))
+            elif dtype == "float32":
+                audio_array = np.frombuffer(audio_data, dtype=np.float32)
+            else:
+                raise ValueError(f"Unsupported sample format: {dtype}")
             
-            # Transcribe
-            result = self.transcribe_audio(tmp_path, language=language)
+            # Both backends take the array directly, but only at 16 kHz
+            if sample_rate != WHISPER_SAMPLE_RATE:
+                if resample_poly is None:
+                    raise ImportError("scipy not installed. Install with: pip install scipy")
+                g = gcd(WHISPER_SAMPLE_RATE, sample_rate)
+                audio_array = resample_poly(
+                    audio_array, WHISPER_SAMPLE_RATE // g, sample_rate // g
+                ).astype(np.float32, copy=False)
             
-            # Cleanup
-            os.unlink(tmp_path)
-            
-            return result
+            return self._transcribe(audio_array, language, "transcribe")
             
         except Exception as e:
             return {
@@ -138,25 +400,191 @@ class WhisperProcessor:
                 "error": f"Error processing audio data: {str(e)}"
             }
     
-    def get_available_models(self) -> list:
-        """Return list of available Whisper models"""
-        return ["tiny", "base", "small", "medium", "large", "large-v2", "large-v3"]
+    def get_available_models(self) -> Tuple[str, ...]:
+        """Return available Whisper models (shared immutable tuple)"""
+        return _AVAILABLE_MODELS
     
     def is_loaded(self) -> bool:
         """Check if model is loaded"""
         return self.model is not None
 
 
-# Singleton instance for global use
-_whisper_processor: Optional[WhisperProcessor] = None
+class BatchedTranscriber:
+    """
+    Coalesces concurrent transcriptions into batched openai-whisper decodes.
+    Clips that fit one 30 s window and arrive within BATCH_WINDOW of each
+    other (up to MAX_BATCH) share a single encoder/decoder forward on the
+    GPU; longer clips take the regular per-request path.
+    """
+    
+    def __init__(self, processor: WhisperProcessor):
+        self.processor = processor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def transcribe(self, audio_path: str, language: Optional[str] = None,
+                         task: str = "transcribe") -> Dict[str, Any]:
+        """Queue one file for the next batch and wait for its result"""
+        try:
+            audio = await asyncio.to_thread(_whisper.load_audio, audio_path)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Transcription error: {str(e)}"
+            }
+        
+        if audio.shape[0] > _whisper.audio.N_SAMPLES:
+            return await asyncio.to_thread(self.processor.transcribe_audio, audio_path, language, task)
+        
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio, language, task, future))
+        return await future
+    
+    async def _run(self):
+        """Collect requests for up to BATCH_WINDOW, then decode them together"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + BATCH_WINDOW
+            while len(batch) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # DecodingOptions take one language and task, so decode each group together
+            groups: Dict[Tuple[Optional[str], str], List] = {}
+            for item in batch:
+                groups.setdefault((item[1], item[2]), []).append(item)
+            
+            for (language, task), items in groups.items():
+                try:
+                    results = await asyncio.to_thread(
+                        self._decode_batch, [item[0] for item in items], language, task
+                    )
+                except Exception as e:
+                    results = [{
+                        "success": False,
+                        "error": f"Transcription error: {str(e)}"
+                    }] * len(items)
+                for (_, _, _, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+    
+    def _decode_batch(self, audios: List, language: Optional[str], task: str) -> List[Dict[str, Any]]:
+        """
+        VAD-trim each clip as the per-request path does, build its log-mel on
+        the GPU, then run one batched whisper.decode with timestamps.
+        """
+        processor = self.processor
+        model = processor.model
+        n_mels = model.dims.n_mels
+        decoded = {}
+        with processor._infer_lock, _torch.inference_mode():
+            # The Silero VAD model is stateful, so it shares the inference lock
+            speech = [processor._speech_only(audio) for audio in audios]
+            pending = [i for i, (clip, _) in enumerate(speech) if clip.shape[0]]
+            if pending:
+                # Per clip so each keeps its own log-mel normalisation
+                mel = _torch.stack([
+                    _whisper.log_mel_spectrogram(
+                        _whisper.pad_or_trim(_torch.from_numpy(speech[i][0]).to(model.device)), n_mels
+                    )
+                    for i in pending
+                ])
+                options = _whisper.DecodingOptions(task=task, language=language, fp16=True)
+                decoded = dict(zip(pending, _whisper.decode(model, mel, options)))
+        
+        tokenizer = _whisper.tokenizer.get_tokenizer(
+            model.is_multilingual, num_languages=model.num_languages,
+            language=language, task=task
+        )
+        results = []
+        for i, audio in enumerate(audios):
+            duration = audio.shape[0] / WHISPER_SAMPLE_RATE
+            res = decoded.get(i)
+            if res is None:
+                results.append({
+                    "success": True,
+                    "text": "",
+                    **_segment_columns([], [], []),
+                    "language": language or "auto",
+                    "duration": duration
+                })
+                continue
+            
+            clip, offsets = speech[i]
+            starts, ends, texts = _token_segments(
+                res.tokens, tokenizer, clip.shape[0] / WHISPER_SAMPLE_RATE
+            )
+            if offsets:
+                starts = processor._restore_times(starts, offsets, bisect.bisect_right)
+                ends = processor._restore_times(ends, offsets, bisect.bisect_left)
+            results.append({
+                "success": True,
+                "text": res.text.strip(),
+                **_segment_columns(starts, ends, texts),
+                "language": res.language or language or "auto",
+                "duration": duration
+            })
+        return results
+
+
+def _token_segments(tokens: List[int], tokenizer, duration: float) -> Tuple[List[float], List[float], List[str]]:
+    """
+    Split decoded tokens into segments at timestamp tokens, the way
+    whisper.transcribe does for one 30 s window
+    (<|0.00|> text <|2.40|><|2.40|> text <|5.00|>).
+    """
+    timestamp_begin = tokenizer.timestamp_begin
+    starts, ends, texts = [], [], []
+    start, text_tokens = None, []
+    for token in tokens:
+        if token < timestamp_begin:
+            text_tokens.append(token)
+            continue
+        t = (token - timestamp_begin) * TIMESTAMP_PRECISION
+        if start is not None and text_tokens:
+            starts.append(start)
+            ends.append(t)
+            texts.append(tokenizer.decode(text_tokens))
+            start, text_tokens = None, []
+        else:
+            start = t
+    if text_tokens:
+        # No closing timestamp: the segment runs to the end of the clip
+        starts.append(start if start is not None else 0.0)
+        ends.append(duration)
+        texts.append(tokenizer.decode(text_tokens))
+    return starts, ends, texts
+
+
+# Processors keyed by (model_name, device); loaded weights stay resident for the process
+_MODEL_STATE: Dict[Tuple[str, str], WhisperProcessor] = {}
+_model_state_lock = threading.Lock()
 
 
 def get_whisper_processor(model_name: str = "base", device: str = "cpu") -> WhisperProcessor:
-    """Get or create Whisper processor singleton"""
-    global _whisper_processor
-    if _whisper_processor is None:
-        _whisper_processor = WhisperProcessor(model_name, device)
-    return _whisper_processor
+    """Get or create the Whisper processor for a model/device pair (thread-safe)"""
+    if model_name not in _AVAILABLE_MODELS:
+        raise ValueError(f"Unknown Whisper model: {model_name}")
+    
+    key = (model_name, device)
+    processor = _MODEL_STATE.get(key)
+    if processor is None:
+        with _model_state_lock:
+            processor = _MODEL_STATE.get(key)
+            if processor is None:
+                processor = WhisperProcessor(model_name, device)
+                _MODEL_STATE[key] = processor
+    return processor
 
 
 def transcribe(audio_path: str, language: Optional[str] = None) -> Dict[str, Any]:
@@ -7,27 +7,40 @@ import os
 import tempfile
 from typing import Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 
-router = APIRouter(prefix="/audio", tags=["audio"])
+try:
+    import orjson
+    _ResponseClass = ORJSONResponse
+except ImportError:
+    _ResponseClass = JSONResponse
+
+# orjson encodes the float-heavy transcription payloads much faster than json.dumps
+router = APIRouter(prefix="/audio", tags=["audio"], default_response_class=_ResponseClass)
+
+# Bytes read from an upload per await when spooling it to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 # Audio processors (lazy loaded)
-_whisper_processor = None
 _tts_processor = None
 _audio_recorder = None
 
 
-def get_whisper_processor():
-    """Get or create Whisper processor"""
-    global _whisper_processor
-    if _whisper_processor is None:
-        try:
-            from backend.audio.whisper_processor import WhisperProcessor
-            _whisper_processor = WhisperProcessor(model_name="base")
-        except Exception as e:
-            print(f"Error loading Whisper: {e}")
-            return None
-    return _whisper_processor
+def get_whisper_processor(model: str = "base"):
+    """
+    Get the Whisper processor for a model size.
+    Processors are cached per (model, device) in whisper_processor, so
+    switching models between requests reuses already-loaded weights.
+    """
+    try:
+        from backend.audio.whisper_processor import get_whisper_processor as get_processor
+        return get_processor(model_name=model)
+    except ValueError:
+        raise
+    except Exception as e:
+        print(f"Error loading Whisper: {e}")
+        return None
 
 
 def get_tts_processor():
@@ -43,6 +56,46 @@ def get_tts_processor():
     return _tts_processor
 
 
+class _AudioSpool:
+    """
+    Temporary on-disk copy of an uploaded audio file.
+    On Linux it is an unnamed O_TMPFILE inode, reached through its
+    /proc fd link and reclaimed by the kernel on close, so there is no
+    directory entry to create or unlink. Elsewhere (or if the filesystem
+    lacks O_TMPFILE) it falls back to a NamedTemporaryFile.
+    """
+    
+    def __init__(self, suffix: str):
+        self._unlink = False
+        self.fd = -1
+        if hasattr(os, "O_TMPFILE"):
+            try:
+                self.fd = os.open(tempfile.gettempdir(), os.O_TMPFILE | os.O_RDWR, 0o600)
+                # pid rather than "self": ffmpeg opens the path from a child process
+                self.path = f"/proc/{os.getpid()}/fd/{self.fd}"
+            except OSError:
+                self.fd = -1
+        if self.fd < 0:
+            self.fd, self.path = tempfile.mkstemp(suffix=suffix)
+            self._unlink = True
+    
+    def write(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+    
+    def close(self):
+        if self.fd < 0:
+            return
+        if hasattr(os, "posix_fadvise"):
+            # The audio has been decoded; don't keep it in the page cache
+            os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        os.close(self.fd)
+        self.fd = -1
+        if self._unlink and os.path.exists(self.path):
+            os.unlink(self.path)
+
+
 # ── Request Models ────────────────────────────────────────────────────────────
 
 class TTSRequest(BaseModel):
@@ -86,23 +139,28 @@ async def transcribe_audio(
             detail=f"Unsupported file format. Allowed: {', '.join(allowed_extensions)}"
         )
     
-    # Save uploaded file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp:
-        content = await audio.read()
-        tmp.write(content)
-        tmp_path = tmp.name
+    spool = _AudioSpool(file_ext)
     
     try:
+        # Save uploaded file chunk by chunk (never holds the whole upload in memory)
+        while chunk := await audio.read(UPLOAD_CHUNK_SIZE):
+            spool.write(chunk)
+        
         # Get processor
-        processor = get_whisper_processor()
+        try:
+            processor = get_whisper_processor(model)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         if processor is None:
             raise HTTPException(
                 status_code=500,
                 detail="Whisper not available. Install: pip install openai-whisper"
             )
         
-        # Transcribe
-        result = processor.transcribe_audio(tmp_path, language=language)
+        # Transcribe off the event loop; concurrent GPU requests are batched
+        result = await processor.transcribe_audio_async(
+            spool.path, language=None if language == "auto" else language
+        )
         
         if result.get("success"):
             return {
@@ -110,7 +168,9 @@ async def transcribe_audio(
                 "text": result["text"],
                 "language": result.get("language", language),
                 "duration": result.get("duration", 0),
-                "segments": result.get("segments", [])
+                "segments_start": result.get("segments_start", []),
+                "segments_end": result.get("segments_end", []),
+                "segments_text": result.get("segments_text", [])
             }
         else:
             raise HTTPException(
@@ -120,8 +180,7 @@ async def transcribe_audio(
     
     finally:
         # Cleanup
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+        spool.close()
 
 
 @router.post("/speak")
@@ -219,12 +278,14 @@ async def audio_status():
     Returns:
         Status of STT and TTS systems
     """
-    whisper_ok = get_whisper_processor() is not None and get_whisper_processor().is_loaded()
-    tts_ok = get_tts_processor() is not None and get_tts_processor().is_available()
+    whisper = get_whisper_processor()
+    tts = get_tts_processor()
+    whisper_ok = whisper is not None and whisper.ensure_loaded()
+    tts_ok = tts is not None and tts.is_available()
     
     return {
         "stt_available": whisper_ok,
         "tts_available": tts_ok,
-        "stt_model": get_whisper_processor().model_name if whisper_ok else None,
+        "stt_model": whisper.model_name if whisper_ok else None,
         "platform": os.name
     }
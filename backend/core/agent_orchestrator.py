@@ -6,8 +6,16 @@ Esta clase abstrae la ejecución de los agentes del enrutador FastAPI.
 """
 import sys
 import json
+import asyncio
 from typing import Dict, Any
 
+from core.company_matcher import CompanyMatcher
+
+# Se carga una vez al importar; solo las consultas que nombran una empresa pagan el LLM de tickers
+_COMPANY_MATCHER = CompanyMatcher.from_file()
+
+_TICKER_PROMPT = "Rewrite this query by replacing any company name with its exact stock ticker (e.g. Apple -> AAPL, Microsoft -> MSFT). If there are no company names, output the original query exactly as is. ONLY OUTPUT THE REWRITTEN QUERY:\n{cmd}"
+
 class AgentOrchestrator:
     def __init__(self, llm, planner, executor, summarizer, get_tools_desc_func):
         self.llm = llm
@@ -23,17 +31,25 @@ class AgentOrchestrator:
         """
         try:
             # Step 0: Pre-process query to resolve tickers
-            sys.stderr.write(f"[PRE-PROCESS] Resolving company names to tickers...\n")
-            ticker_prompt = f"Rewrite this query by replacing any company name with its exact stock ticker (e.g. Apple -> AAPL, Microsoft -> MSFT). If there are no company names, output the original query exactly as is. ONLY OUTPUT THE REWRITTEN QUERY:\n{cmd}"
-            resolved_cmd = self.llm.chat([{"role": "user", "content": ticker_prompt}]).strip()
-            sys.stderr.write(f"[PRE-PROCESS] Resolved query: {resolved_cmd}\n")
+            if _COMPANY_MATCHER.contains_company(cmd):
+                sys.stderr.write(f"[PRE-PROCESS] Resolving company names to tickers...\n")
+                ticker_prompt = _TICKER_PROMPT.format(cmd=cmd)
+                # La llamada al LLM corre fuera del event loop
+                resolved_cmd = await asyncio.to_thread(
+                    self.llm.chat, [{"role": "user", "content": ticker_prompt}]
+                )
+                resolved_cmd = resolved_cmd.strip()
+                sys.stderr.write(f"[PRE-PROCESS] Resolved query: {resolved_cmd}\n")
+            else:
+                # Sin nombres de empresa conocidos: se omite el LLM de tickers
+                resolved_cmd = cmd
 
             # Step 1: Get plan from Planner
             sys.stderr.write(f"[PLANNER] Analyzing request: {resolved_cmd}\n")
             plan_str = await self.planner.plan(resolved_cmd, self.get_tools_desc_func())
             
             # Clean possible markdown formatting from the plan
-            plan_str = plan_str.replace("```json", "").replace("```", "").strip()
+            plan_str = plan_str.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
             
             try:
                 plan = json.loads(plan_str)
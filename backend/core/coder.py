@@ -8,6 +8,12 @@ from typing import Dict
 from utils.llm_client import LLMClient
 from prompts.coder_prompt_v2 import CODER_PROMPT_V2
 
+# One alternation so the response is scanned once for all three sections
+_SECTION_RE = re.compile(
+    r"(FILEPATH|DESCRIPTION):\s*([^\n]+)|CODE:\s*```(?:python)?\n(.*?)```",
+    re.DOTALL
+)
+
 class DirectCoder:
     """Generates code files directly from user descriptions."""
     
@@ -34,13 +40,17 @@ class DirectCoder:
     
     def _parse_response(self, text: str) -> Dict[str, str]:
         """Parses the specialized output format."""
-        path_match = re.search(r"FILEPATH:\s*(.+)", text)
-        desc_match = re.search(r"DESCRIPTION:\s*(.+)", text)
-        code_match = re.search(r"CODE:\s*```(?:python)?\n(.*?)```", text, re.DOTALL)
+        sections = {}
+        for match in _SECTION_RE.finditer(text):
+            key = match.group(1) or "CODE"
+            if key not in sections:
+                sections[key] = match.group(2) if match.group(1) else match.group(3)
+                if len(sections) == 3:
+                    break
         
-        path = path_match.group(1).strip() if path_match else "generated_script.py"
-        desc = desc_match.group(1).strip() if desc_match else "Generated script"
-        code = code_match.group(1).strip() if code_match else text # Fallback to raw text if no block
+        path = sections["FILEPATH"].strip() if "FILEPATH" in sections else "generated_script.py"
+        desc = sections["DESCRIPTION"].strip() if "DESCRIPTION" in sections else "Generated script"
+        code = sections["CODE"].strip() if "CODE" in sections else text # Fallback to raw text if no block
         
         # Clean up path separators
         path = path.replace("\\", "/")
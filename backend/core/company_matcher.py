@@ -0,0 +1,62 @@
+"""
+Company-name matcher.
+Decides whether a query mentions a known company (and so needs ticker
+resolution) with a single scan of the text: an Aho-Corasick automaton when
+pyahocorasick is installed, otherwise one compiled regex alternation.
+"""
+import os
+import re
+from typing import Iterable
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+COMPANY_NAMES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "company_names.txt")
+
+
+class CompanyMatcher:
+    """Case-insensitive, word-bounded lookup of company names in free text."""
+    
+    def __init__(self, names: Iterable[str]):
+        names = sorted({n.strip().lower() for n in names if n.strip()}, key=len, reverse=True)
+        self._automaton = None
+        self._regex = None
+        
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for name in names:
+                self._automaton.add_word(name, len(name))
+            self._automaton.make_automaton()
+        elif names:
+            # Longest names first so the alternation prefers full matches
+            self._regex = re.compile(
+                r"(?<!\w)(?:" + "|".join(map(re.escape, names)) + r")(?!\w)"
+            )
+    
+    @classmethod
+    def from_file(cls, path: str = COMPANY_NAMES_FILE) -> "CompanyMatcher":
+        """Load names from a text file (one per line, '#' starts a comment)."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                names = [line for line in f if not line.lstrip().startswith("#")]
+        except OSError:
+            names = []
+        return cls(names)
+    
+    def contains_company(self, text: str) -> bool:
+        """True if any known company name appears in text as whole words."""
+        text = text.lower()
+        if self._automaton is not None:
+            for end, length in self._automaton.iter(text):
+                start = end - length + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end + 1 < len(text) and text[end + 1].isalnum():
+                    continue
+                return True
+            return False
+        if self._regex is not None:
+            return self._regex.search(text) is not None
+        return False
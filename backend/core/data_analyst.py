@@ -5,19 +5,298 @@ Handles /plot and /describe commands.
 - Searches for files recursively across all storage subdirectories.
 - If the target name looks like a stock ticker/company name rather than a file,
   dynamically fetches historical data via yfinance, saves it to storage/.cache/
-  as a temporary CSV, and uses it for analysis.
+  as a temporary Parquet file (CSV without pyarrow), and uses it for analysis.
 - The .cache/ directory is purged on DataAnalyst shutdown (registered via atexit).
 """
 import os
 import re
+import csv
 import json
+import time
 import atexit
 import shutil
+import threading
+import warnings
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, Tuple
 import yfinance as yf
 
-KNOWN_FILE_EXTENSIONS = {".csv", ".json", ".xls", ".xlsx", ".txt"}
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    pa = None
+    pc = None
+    pacsv = None
+    pq = None
+    CSV_ENGINE = "c"
+
+KNOWN_FILE_EXTENSIONS = frozenset({".csv", ".json", ".xls", ".xlsx", ".txt", ".parquet"})
+
+# Letters only, spaces allowed anywhere (a company name rather than a file name)
+_NAME_RE = re.compile(r" *(?:[^\W\d_] *)+")
+
+# Markdown code fences the LLM wraps its JSON answer in
+_FENCE_RE = re.compile(r"```(?:json)?\s*")
+_JSON_DECODER = json.JSONDecoder()
+
+# Rows read to sniff the header and column dtypes before the real load
+PROBE_ROWS = 200
+# Only this many numeric columns are analysed, so only these are loaded
+MAX_ANALYSIS_COLS = 5
+
+# CSVs above this size are streamed with pyarrow instead of loaded whole
+LARGE_CSV_BYTES = 200 * 1024 * 1024
+STREAM_BLOCK_BYTES = 8 << 20
+# Rows per chunk when a large CSV has to be streamed through pandas instead
+STREAM_CHUNK_ROWS = 1_000_000
+# Rows kept (reservoir-sampled) from a streamed CSV for plotting
+STREAM_SAMPLE_ROWS = 5000
+
+# Parsed CSV tables kept for repeat /plot and /describe calls (LRU by bytes)
+CSV_TABLE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Rows sent to the frontend for a Vega-Lite chart (evenly strided)
+PLOT_MAX_ROWS = 5000
+
+# How long a downloaded history stays fresh, by yfinance period (seconds)
+HISTORY_TTL = {"1d": 300, "5d": 900, "1mo": 3600, "3mo": 3600, "6mo": 86400, "1y": 86400}
+DEFAULT_HISTORY_TTL = 3600
+
+
+def _is_number(dtype) -> bool:
+    """Same selection as select_dtypes(include="number"): numeric, but not bool."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _arrow_csv_options(headerless: bool, columns, float_types: bool = False,
+                       block_size: int = STREAM_BLOCK_BYTES):
+    """
+    pyarrow CSV read/convert options restricted to `columns`.
+    Returns (read_options, convert_options, pyarrow column names).
+    """
+    if headerless:
+        # pyarrow names headerless columns f0, f1, ...; the probe used 0, 1, ...
+        read_options = pacsv.ReadOptions(block_size=block_size, use_threads=True,
+                                          autogenerate_column_names=True)
+        include = [f"f{c}" for c in columns]
+    else:
+        read_options = pacsv.ReadOptions(block_size=block_size, use_threads=True)
+        include = [str(c) for c in columns]
+    convert_options = pacsv.ConvertOptions(
+        include_columns=include,
+        column_types={name: pa.float64() for name in include} if float_types else None,
+    )
+    return read_options, convert_options, include
+
+
+# path -> ((mtime_ns, size, headerless, columns), table), least recently used first
+_csv_tables: "OrderedDict[str, tuple]" = OrderedDict()
+_csv_tables_lock = threading.Lock()
+
+
+def _read_csv_table(file_path: str, mtime_ns: int, size: int, headerless: bool, columns: tuple):
+    """
+    Parse `columns` of a CSV with pyarrow's multi-threaded reader.
+    One table is cached per path, so repeated /plot and /describe calls on an
+    unchanged file reuse it and a new version of the file replaces the old
+    one. Least recently used tables are dropped beyond CSV_TABLE_CACHE_BYTES.
+    """
+    version = (mtime_ns, size, headerless, columns)
+    with _csv_tables_lock:
+        entry = _csv_tables.get(file_path)
+        if entry is not None and entry[0] == version:
+            _csv_tables.move_to_end(file_path)
+            return entry[1]
+
+    read_options, convert_options, _ = _arrow_csv_options(headerless, columns)
+    table = pacsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+    table = table.rename_columns(list(columns))
+
+    with _csv_tables_lock:
+        _csv_tables.pop(file_path, None)
+        if table.nbytes <= CSV_TABLE_CACHE_BYTES:
+            _csv_tables[file_path] = (version, table)
+            total = sum(t.nbytes for _, t in _csv_tables.values())
+            while total > CSV_TABLE_CACHE_BYTES:
+                _, (_, evicted) = _csv_tables.popitem(last=False)
+                total -= evicted.nbytes
+    return table
+
+
+def _arrow_summary(table) -> pd.DataFrame:
+    """describe()-layout table computed with pyarrow.compute kernels on the columns."""
+    stats = {}
+    for name, column in zip(table.column_names, table.columns):
+        column = pc.cast(column, pa.float64())
+        bounds = pc.min_max(column)
+        stats[name] = [
+            pc.count(column).as_py(),
+            pc.mean(column).as_py(),
+            pc.stddev(column, ddof=1).as_py(),
+            bounds["min"].as_py(),
+            *pc.quantile(column, q=[0.25, 0.5, 0.75]).to_pylist(),
+            bounds["max"].as_py(),
+        ]
+    return pd.DataFrame(stats, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"], dtype="float64")
+
+
+def _numpy_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    describe()-layout table for numeric columns, computed on one float64 block
+    with NumPy's nan-aware reductions (one vectorised pass per statistic
+    across all columns instead of per-column Python dispatch).
+    """
+    arr = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings():
+        # All-NaN columns yield NaN statistics, as describe() does
+        warnings.simplefilter("ignore", RuntimeWarning)
+        stats = np.vstack([
+            np.count_nonzero(~np.isnan(arr), axis=0),
+            np.nanmean(arr, axis=0),
+            np.nanstd(arr, axis=0, ddof=1),
+            np.nanmin(arr, axis=0),
+            np.nanpercentile(arr, [25, 50, 75], axis=0),
+            np.nanmax(arr, axis=0),
+        ])
+    return pd.DataFrame(stats, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"], columns=df.columns)
+
+
+def _summary_markdown(summary: pd.DataFrame) -> str:
+    """
+    Render a describe() table as Markdown. Uses DataFrame.to_markdown when
+    tabulate is installed, else a direct pipe-table formatter over the rows.
+    """
+    try:
+        return summary.to_markdown()
+    except ImportError:
+        pass
+    lines = [
+        "| | " + " | ".join(str(c) for c in summary.columns) + " |",
+        "|:--|" + "--:|" * len(summary.columns),
+    ]
+    for row in summary.itertuples():
+        lines.append(f"| {row[0]} | " + " | ".join(f"{v:g}" for v in row[1:]) + " |")
+    return "\n".join(lines)
+
+
+class _IndexInvalidator(FileSystemEventHandler):
+    """Marks the DataAnalyst file index dirty on any change outside .cache/."""
+
+    def __init__(self, analyst):
+        self.analyst = analyst
+
+    def on_any_event(self, event):
+        if not str(event.src_path).startswith(self.analyst.cache_dir):
+            self.analyst._index_dirty = True
+
+
+def _stream_summary(blocks, columns: list) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    describe() statistics over an iterator of float64 (rows x columns) blocks.
+    count/mean/std/min/max are accumulated exactly per block (Chan/Welford
+    merge); quartiles are estimated from a reservoir sample of
+    STREAM_SAMPLE_ROWS rows, which is also returned as the plotting data.
+    Memory stays bounded by one block plus the sample.
+    """
+    k = len(columns)
+    count = np.zeros(k)
+    mean = np.zeros(k)
+    m2 = np.zeros(k)
+    lo = np.full(k, np.inf)
+    hi = np.full(k, -np.inf)
+    sample = np.empty((STREAM_SAMPLE_ROWS, k))
+    sample_pos = np.empty(STREAM_SAMPLE_ROWS, dtype=np.int64)
+    rng = np.random.default_rng()
+    seen = 0
+
+    for block in blocks:
+        n_rows = len(block)
+        if not n_rows:
+            continue
+
+        # Merge this block's moments into the running ones, per column
+        valid = ~np.isnan(block)
+        n_b = valid.sum(axis=0)
+        has = n_b > 0
+        mean_b = np.divide(np.nansum(block, axis=0), n_b, out=np.zeros(k), where=has)
+        m2_b = np.nansum((block - mean_b) ** 2, axis=0)
+        total = count + n_b
+        delta = mean_b - mean
+        mean = np.where(has, mean + delta * np.divide(n_b, total, out=np.zeros(k), where=has), mean)
+        m2 = m2 + m2_b + np.divide(delta ** 2 * count * n_b, total, out=np.zeros(k), where=has)
+        count = total
+        if has.any():
+            lo = np.fmin(lo, np.nanmin(np.where(valid, block, np.inf), axis=0))
+            hi = np.fmax(hi, np.nanmax(np.where(valid, block, -np.inf), axis=0))
+
+        # Reservoir sample (algorithm R): fill first, then each row i
+        # replaces a random slot with probability STREAM_SAMPLE_ROWS / (i + 1)
+        positions = np.arange(seen, seen + n_rows)
+        fill = max(0, min(n_rows, STREAM_SAMPLE_ROWS - seen))
+        if fill:
+            sample[seen:seen + fill] = block[:fill]
+            sample_pos[seen:seen + fill] = positions[:fill]
+        if fill < n_rows:
+            slots = rng.integers(0, positions[fill:] + 1)
+            keep = slots < STREAM_SAMPLE_ROWS
+            sample[slots[keep]] = block[fill:][keep]
+            sample_pos[slots[keep]] = positions[fill:][keep]
+        seen += n_rows
+
+    n_sample = min(seen, STREAM_SAMPLE_ROWS)
+    order = np.argsort(sample_pos[:n_sample])
+    data = pd.DataFrame(sample[:n_sample][order], columns=columns)
+
+    quartiles = np.nanpercentile(data.to_numpy(), [25, 50, 75], axis=0) if n_sample else np.full((3, k), np.nan)
+    std = np.sqrt(np.divide(m2, count - 1, out=np.full(k, np.nan), where=count > 1))
+    summary = pd.DataFrame(
+        [count, np.where(count > 0, mean, np.nan), std,
+         np.where(count > 0, lo, np.nan), *quartiles, np.where(count > 0, hi, np.nan)],
+        index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+        columns=columns,
+    )
+    return data, summary
+
+
+def _arrow_float_blocks(file_path: str, headerless: bool, columns: list):
+    """Stream `columns` of a CSV as float64 blocks with pyarrow's multi-threaded reader"""
+    read_options, convert_options, include = _arrow_csv_options(headerless, columns, float_types=True)
+    with pacsv.open_csv(file_path, read_options=read_options, convert_options=convert_options) as reader:
+        for batch in reader:
+            yield np.column_stack([
+                batch.column(name).to_numpy(zero_copy_only=False) for name in include
+            ]).astype(np.float64, copy=False)
+
+
+def _pandas_float_blocks(file_path: str, headerless: bool, columns: list, text_columns: set):
+    """
+    Stream `columns` of a CSV as float64 blocks with pandas' chunked reader.
+    Values that don't parse become NaN; their columns are added to `text_columns`.
+    """
+    chunks = pd.read_csv(file_path, header=None if headerless else 0, usecols=columns,
+                         chunksize=STREAM_CHUNK_ROWS, low_memory=False)
+    for chunk in chunks:
+        block = np.empty((len(chunk), len(columns)))
+        for j, name in enumerate(columns):
+            raw = chunk[name]
+            values = pd.to_numeric(raw, errors="coerce")
+            if (values.isna() & raw.notna()).any():
+                text_columns.add(name)
+            block[:, j] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        yield block
 
 
 class DataAnalyst:
@@ -26,6 +305,17 @@ class DataAnalyst:
         self.storage_dir = storage_dir
         self.cache_dir = os.path.join(storage_dir, ".cache")
         os.makedirs(self.cache_dir, exist_ok=True)
+        # {lower_name: path} for every file in storage, plus the directory
+        # mtimes it was built from (see _refresh_index)
+        self._index: Optional[Dict[str, str]] = None
+        self._index_mtimes: Dict[str, int] = {}
+        # With watchdog installed, filesystem events mark the index dirty and
+        # lookups skip the per-directory stat check entirely
+        self._index_dirty = True
+        self._observer = self._start_observer()
+        # {(ticker, period): (cache_path, fetched_at)} and reusable yf.Ticker objects
+        self._yf_cache: Dict[tuple, tuple] = {}
+        self._ticker_objs: Dict[str, Any] = {}
         # Auto-purge cache directory on process exit
         atexit.register(self._purge_cache)
 
@@ -33,25 +323,103 @@ class DataAnalyst:
 
     def _purge_cache(self):
         """Delete all temporary files in .cache/ on shutdown."""
+        if self._observer is not None:
+            self._observer.stop()
         try:
             shutil.rmtree(self.cache_dir, ignore_errors=True)
         except Exception:
             pass
 
+    def _start_observer(self):
+        """Watch storage_dir for changes, if watchdog is available."""
+        if Observer is None:
+            return None
+        try:
+            observer = Observer()
+            observer.schedule(_IndexInvalidator(self), self.storage_dir, recursive=True)
+            observer.daemon = True
+            observer.start()
+            return observer
+        except Exception:
+            return None
+
     # ─────────────────── File Resolution ──────────────────────────────────────
 
+    def _iter_storage_files(self, dirs: Optional[list] = None):
+        """
+        Yield a DirEntry for every file under storage_dir, skipping .cache/.
+        Uses os.scandir with an explicit stack so callers can stop at the
+        first hit and file type checks come from the directory listing.
+        Every directory visited is appended to `dirs` if given.
+        """
+        stack = deque([self.storage_dir])
+        while stack:
+            path = stack.pop()
+            try:
+                it = os.scandir(path)
+            except OSError:
+                continue
+            if dirs is not None:
+                dirs.append(path)
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Skip the .cache folder from search matches
+                        if entry.name != ".cache":
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        # d_type answers this without a stat; only symlinks are
+                        # resolved, so links to files still match (as with os.walk)
+                        # while links to directories are neither entered nor matched
+                        yield entry
+
+    def _refresh_index(self) -> Dict[str, str]:
+        """
+        Return the file index, rebuilding it only when a directory in storage
+        was added, removed or had its entries changed (its mtime moved).
+        When a watchdog observer is running, its events decide instead.
+        """
+        if self._observer is not None and self._observer.is_alive():
+            if self._index is not None and not self._index_dirty:
+                return self._index
+            # Cleared before the walk so changes made during it trigger another
+            self._index_dirty = False
+        elif self._index is not None:
+            try:
+                stale = any(os.stat(d).st_mtime_ns != m for d, m in self._index_mtimes.items())
+            except OSError:
+                stale = True
+            if not stale:
+                return self._index
+
+        dirs = []
+        index = {}
+        for entry in self._iter_storage_files(dirs):
+            # First hit wins on duplicate names, as with a direct walk
+            index.setdefault(entry.name.lower(), entry.path)
+        mtimes = {}
+        for d in dirs:
+            try:
+                mtimes[d] = os.stat(d).st_mtime_ns
+            except OSError:
+                pass
+        self._index, self._index_mtimes = index, mtimes
+        return index
+
     def _find_file_recursive(self, target: str) -> Optional[str]:
         """
         Recursively search all subdirectories of storage_dir for a file
         whose name contains the target string (case-insensitive).
         Returns the full absolute path if found, else None.
         """
-        for root, dirs, files in os.walk(self.storage_dir):
-            # Skip the .cache folder from search matches
-            dirs[:] = [d for d in dirs if d != ".cache"]
-            for f in files:
-                if target.lower() in f.lower():
-                    return os.path.join(root, f)
+        t = target.lower()
+        index = self._refresh_index()
+        path = index.get(t)
+        if path is not None:
+            return path
+        for name, path in index.items():
+            if t in name:
+                return path
         return None
 
     def _is_stock_request(self, target: str) -> bool:
@@ -65,7 +433,7 @@ class DataAnalyst:
         if ext.lower() in KNOWN_FILE_EXTENSIONS:
             return False
         # If it's short (likely ticker) or doesn't look like a filename
-        return len(target) <= 10 or target.replace(" ", "").isalpha()
+        return len(target) <= 10 or _NAME_RE.fullmatch(target) is not None
 
     def _resolve_ticker(self, query: str) -> Optional[str]:
         """
@@ -85,24 +453,152 @@ class DataAnalyst:
 
     def _fetch_stock_to_cache(self, ticker: str, period: str = "1y") -> Optional[str]:
         """
-        Download historical OHLCV data for `ticker` and write it to .cache/.
-        Returns the path of the created CSV file, or None on failure.
+        Download historical OHLCV data for `ticker` and write it to .cache/
+        as Parquet (CSV if pyarrow is not installed).
+        A download younger than the period's TTL is reused instead.
+        Returns the path of the created file, or None on failure.
         """
+        key = (ticker, period)
+        cached = self._yf_cache.get(key)
+        if cached is not None:
+            path, fetched_at = cached
+            if time.time() - fetched_at < HISTORY_TTL.get(period, DEFAULT_HISTORY_TTL) and os.path.exists(path):
+                return path
         try:
-            stock = yf.Ticker(ticker)
+            stock = self._ticker_objs.get(ticker)
+            if stock is None:
+                stock = self._ticker_objs[ticker] = yf.Ticker(ticker)
             df = stock.history(period=period)
             if df.empty:
                 return None
             df.reset_index(inplace=True)
-            # Remove timezone info from datetime column for clean CSV
-            if "Date" in df.columns:
-                df["Date"] = df["Date"].dt.tz_localize(None)
-            cache_path = os.path.join(self.cache_dir, f"{ticker}_history.csv")
-            df.to_csv(cache_path, index=False)
+            if pq is not None:
+                # Binary columnar: no float text round trip, timestamps keep their tz
+                cache_path = os.path.join(self.cache_dir, f"{ticker}_{period}_history.parquet")
+                df.to_parquet(cache_path, compression="snappy", index=False)
+            else:
+                # Remove timezone info from datetime column for clean CSV
+                if "Date" in df.columns:
+                    df["Date"] = df["Date"].dt.tz_localize(None)
+                cache_path = os.path.join(self.cache_dir, f"{ticker}_{period}_history.csv")
+                df.to_csv(cache_path, index=False)
+            self._yf_cache[key] = (cache_path, time.time())
             return cache_path
         except Exception:
             return None
 
+    # ─────────────────── Data Loading ─────────────────────────────────────────
+
+    def _read_dataset(self, file_path: str, ext: str) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+        """
+        Load only the columns the analysis uses.
+        CSV and Excel files are probed on their first PROBE_ROWS rows to pick
+        the leading numeric columns, then re-read with `usecols` so wide files
+        never materialise the columns that would be discarded. With pyarrow,
+        CSVs are parsed by its reader (cached per file version) and summarised
+        with pyarrow.compute; those larger than LARGE_CSV_BYTES are streamed
+        instead (see _scan_large_csv).
+        Returns (data, summary); summary is a precomputed describe() table for
+        CSVs read through pyarrow and None otherwise. data is None for
+        unsupported formats.
+        """
+        if ext == ".json":
+            return pd.read_json(file_path), None
+        if ext == ".parquet":
+            if pq is None:
+                return pd.read_parquet(file_path), None
+            # The footer schema says which columns are numeric; read only those
+            schema = pq.read_schema(file_path)
+            numeric = [
+                f.name for f in schema
+                if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)
+            ][:MAX_ANALYSIS_COLS]
+            return pd.read_parquet(file_path, columns=numeric or None), None
+        if ext == ".csv":
+            reader = pd.read_csv
+        elif ext in [".xls", ".xlsx"]:
+            reader = pd.read_excel
+        else:
+            return None, None
+
+        header = 0
+        if ext == ".csv":
+            header = "infer" if self._csv_has_header(file_path) else None
+        probe = reader(file_path, header=header, nrows=PROBE_ROWS)
+
+        numeric = [
+            i for i, dtype in enumerate(probe.dtypes)
+            if _is_number(dtype)
+        ][:MAX_ANALYSIS_COLS]
+        if not numeric:
+            return probe, None
+        if len(probe) < PROBE_ROWS:
+            # The probe already holds the whole file
+            return probe.iloc[:, numeric], None
+
+        if ext == ".csv" and pacsv is not None:
+            columns = [probe.columns[i] for i in numeric]
+            st = os.stat(file_path)
+            if st.st_size > LARGE_CSV_BYTES:
+                return self._scan_large_csv(file_path, header is None, columns)
+            try:
+                table = _read_csv_table(file_path, st.st_mtime_ns, st.st_size, header is None,
+                                        tuple(str(c) for c in columns))
+            except pa.ArrowInvalid:
+                table = None
+            # If a column the probe saw as numeric holds text further down,
+            # let pandas read it (as object), as it always has
+            if table is not None and all(
+                pa.types.is_integer(t) or pa.types.is_floating(t) for t in table.schema.types
+            ):
+                return table.to_pandas(), _arrow_summary(table)
+        if ext == ".csv":
+            # The pyarrow engine needs a header row to resolve usecols by name
+            if header is None or CSV_ENGINE == "c":
+                try:
+                    # Parse the numeric columns straight into float64 blocks,
+                    # without per-chunk dtype inference
+                    return reader(file_path, header=header, usecols=numeric, engine="c",
+                                  dtype=np.float64, low_memory=False), None
+                except ValueError:
+                    # A column the probe saw as numeric holds text further down
+                    return reader(file_path, header=header, usecols=numeric, engine="c"), None
+            return reader(file_path, usecols=[probe.columns[i] for i in numeric], engine=CSV_ENGINE), None
+        return reader(file_path, usecols=numeric), None
+
+    @staticmethod
+    def _csv_has_header(file_path: str) -> bool:
+        """
+        Heuristics: if the first line looks like data (its first two fields
+        parse as numbers), the file has no header row. Only that line is read.
+        """
+        try:
+            with open(file_path, "r", newline="", encoding="utf-8", errors="replace") as f:
+                first = next(csv.reader(f))
+            [float(c) for c in first[:2]]
+            return False
+        except Exception:
+            return True
+
+    def _scan_large_csv(self, file_path: str, headerless: bool, columns: list) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Stream `columns` of a large CSV through pyarrow's multi-threaded reader
+        and summarise it with _stream_summary. Memory stays bounded by one
+        block plus the plotting sample.
+        """
+        try:
+            return _stream_summary(_arrow_float_blocks(file_path, headerless, columns), columns)
+        except pa.ArrowInvalid:
+            pass
+        # A column the probe saw as numeric holds text further down: rescan in
+        # pandas chunks and leave that column out, as the other paths do
+        text_columns = set()
+        data, summary = _stream_summary(
+            _pandas_float_blocks(file_path, headerless, columns, text_columns), columns
+        )
+        keep = [c for c in columns if c not in text_columns]
+        return data[keep], summary[keep]
+
     # ─────────────────── Main Command Handler ─────────────────────────────────
 
     def handle_data_command(self, cmd: str) -> Dict[str, Any]:
@@ -135,14 +631,9 @@ class DataAnalyst:
                 }
         elif file_path is None:
             # Try fallback: use first available file in storage
-            all_files = []
-            for root, dirs, files in os.walk(self.storage_dir):
-                dirs[:] = [d for d in dirs if d != ".cache"]
-                for f in files:
-                    all_files.append(os.path.join(root, f))
-            if not all_files:
+            file_path = next(iter(self._refresh_index().values()), None)
+            if file_path is None:
                 return {"type": "text", "content": "❌ No datasets found in storage. Upload a file or specify a stock ticker."}
-            file_path = all_files[0]
             display_name = os.path.basename(file_path)
         else:
             display_name = os.path.basename(file_path)
@@ -150,33 +641,25 @@ class DataAnalyst:
         # ── 3. Load the data ──────────────────────────────────────────────────
         try:
             ext = os.path.splitext(file_path)[1].lower()
-            if ext == ".csv":
-                df = pd.read_csv(file_path)
-            elif ext in [".xls", ".xlsx"]:
-                df = pd.read_excel(file_path)
-            elif ext == ".json":
-                df = pd.read_json(file_path)
-            else:
+            df, summary = self._read_dataset(file_path, ext)
+            if df is None:
                 return {"type": "text", "content": f"⚠️ Unsupported format: {ext}"}
 
-            # Heuristics: if header looks like data, re-read without header
-            try:
-                [float(str(c)) for c in df.columns[:2]]
-                df = pd.read_csv(file_path, header=None)
-            except Exception:
-                pass
-
             # Sanitize column names for Vega-Lite
             df.columns = [
                 str(c).strip() if not str(c).strip().isdigit() else f"Feature_{c}"
                 for c in df.columns
             ]
-            numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+            if summary is not None:
+                summary.columns = df.columns
+            numeric_cols = [c for c, dtype in df.dtypes.items() if _is_number(dtype)]
             if not numeric_cols:
                 return {"type": "text", "content": "⚠️ No numeric columns found in the dataset."}
 
-            top_cols = numeric_cols[:5]
-            stats = df[top_cols].describe().to_string()
+            top_cols = numeric_cols[:MAX_ANALYSIS_COLS]
+            if summary is None:
+                summary = _numpy_summary(df[top_cols])
+            stats = summary.to_string()
 
             # ── 4. LLM Vega-Lite generation ───────────────────────────────────
             analyst_prompt = f"""
@@ -208,11 +691,9 @@ class DataAnalyst:
 
             # ── 5. Parse Vega-Lite JSON safely ────────────────────────────────
             try:
-                clean_res = re.sub(r"```json\s*", "", analyst_response)
-                clean_res = re.sub(r"```\s*", "", clean_res)
-                start_idx = clean_res.find("{")
-                end_idx = clean_res.rfind("}") + 1
-                res_j = json.loads(clean_res[start_idx:end_idx])
+                clean_res = _FENCE_RE.sub("", analyst_response)
+                # raw_decode stops at the end of the first complete object
+                res_j, _ = _JSON_DECODER.raw_decode(clean_res, clean_res.index("{"))
                 spec = res_j.get("vega_lite_spec", {})
                 if "selection" not in spec:
                     spec["selection"] = {"grid": {"type": "interval", "bind": "scales"}}
@@ -229,11 +710,17 @@ class DataAnalyst:
 
             # ── 6. Return formatted result ────────────────────────────────────
             if is_plot:
+                # A deterministic stride keeps the chart's shape while bounding
+                # the payload; the browser can't render millions of points anyway
+                step = max(1, -(-len(df) // PLOT_MAX_ROWS))
+                plot_data = df[top_cols].iloc[::step]
+                # Rows straight from the NumPy block: far cheaper than to_dict(orient="records")
+                records = [dict(zip(top_cols, row)) for row in plot_data.to_numpy().tolist()]
                 return {
                     "type": "mixed",
                     "items": [
                         {"type": "text", "content": f"## 🔬 Intelligence Report: `{display_name}`\n{insight}"},
-                        {"type": "vega_lite", "data": df[top_cols].to_dict(orient="records"), "spec": spec},
+                        {"type": "vega_lite", "data": records, "spec": spec},
                     ],
                 }
             else:
@@ -241,7 +728,7 @@ class DataAnalyst:
                     "type": "text",
                     "content": (
                         f"## 📊 Data Summary: `{display_name}`\n{insight}\n\n"
-                        + df[top_cols].describe().to_markdown()
+                        + _summary_markdown(summary)
                     ),
                 }
 
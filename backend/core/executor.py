@@ -2,78 +2,138 @@ import asyncio
 import inspect
 import sys
 import json
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from core.interfaces import BaseExecutor
 
+# Worker threads for synchronous tools (blocking HTTP, file and yfinance calls)
+TOOL_WORKERS = 16
+
 class ToolExecutor(BaseExecutor):
     """Executes a validated plan using available tool instances."""
     
     def __init__(self, tool_instances: Dict[str, Any]):
         self.tool_instances = tool_instances
-        self.results_cache = []
+        self._tool_index: Dict[str, Callable] = {}
+        self._is_async: Dict[str, bool] = {}
+        self._parallel_safe: Dict[str, bool] = {}
+        self._build_tool_index()
+        # Dedicated pool so blocking tools neither stall the event loop nor
+        # compete with other to_thread users for the default executor
+        self._pool = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="tool")
+
+    def _build_tool_index(self):
+        """Indexes every public method of the tool instances by name (first instance wins)."""
+        for instance in self.tool_instances.values():
+            for name in dir(instance):
+                if name.startswith("_") or name in self._tool_index:
+                    continue
+                method = getattr(instance, name, None)
+                if inspect.ismethod(method):
+                    self._tool_index[name] = method
+                    self._is_async[name] = asyncio.iscoroutinefunction(method)
+                    self._parallel_safe[name] = getattr(method, "_parallel_safe", False)
 
     def _find_tool(self, tool_name: str):
         """Finds a tool method by name across all registered instances."""
         if not tool_name or not isinstance(tool_name, str):
             return None
-            
-        for instance in self.tool_instances.values():
-            for name, method in inspect.getmembers(instance, inspect.ismethod):
-                if name == tool_name:
-                    return method
-        return None
+        return self._tool_index.get(tool_name)
+
+    def _can_join_group(self, step: Dict[str, Any]) -> bool:
+        """
+        True if the step may run concurrently with the parallel-safe steps just
+        before it: its tool is marked @tool(parallel_safe=True) and it doesn't
+        consume PREVIOUS_RESULT.
+        """
+        return self._parallel_safe.get(step.get("tool"), False) and not self._depends_on_previous(step)
+
+    @staticmethod
+    def _depends_on_previous(step: Dict[str, Any]) -> bool:
+        """True if any argument of the step references PREVIOUS_RESULT."""
+        args = step.get("args", {})
+        if not isinstance(args, dict):
+            return False
+        return any(isinstance(v, str) and "PREVIOUS_RESULT" in v for v in args.values())
+
+    async def _run_step(self, step: Dict[str, Any], last_result: Any) -> Tuple[str, Any]:
+        """
+        Runs one step and returns (text for the results list, value for PREVIOUS_RESULT).
+        Synchronous tools run on the executor's thread pool so they can overlap
+        with other steps and never block the event loop.
+        """
+        tool_name = step.get("tool")
+        args = step.get("args", {})
+
+        # Substitute PREVIOUS_RESULT
+        processed_args = {}
+        if isinstance(args, dict):
+            for k, v in args.items():
+                if isinstance(v, str) and "PREVIOUS_RESULT" in v:
+                    processed_args[k] = v.replace("PREVIOUS_RESULT", str(last_result))
+                else:
+                    processed_args[k] = v
+
+        tool_method = self._find_tool(tool_name)
+        if not tool_method:
+            error_msg = f"Error: Tool '{tool_name}' not found."
+            return error_msg, error_msg
+
+        try:
+            if self._is_async[tool_name]:
+                result = await tool_method(**processed_args)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._pool, partial(tool_method, **processed_args))
+            return str(result), result
+        except Exception as e:
+            error_msg = f"Error executing {tool_name}: {str(e)}"
+            return error_msg, error_msg
+
+    async def _run_group(self, group: List[Dict[str, Any]], last_result: Any, results: List[str]) -> Any:
+        """Runs independent steps concurrently, appends them to `results` in plan order and returns the last value."""
+        outcomes = await asyncio.gather(*(self._run_step(step, last_result) for step in group))
+        for text, _ in outcomes:
+            results.append(text)
+        return outcomes[-1][1]
 
     async def execute(self, plan: List[Dict[str, Any]]) -> List[str]:
         """
-        Executes each step in the plan sequentially.
+        Executes the plan in order. Only runs of consecutive steps whose tools
+        are marked parallel-safe (read-only fetches) and that don't reference
+        PREVIOUS_RESULT run concurrently; every other step runs alone, after
+        the steps before it have finished. Results are returned in plan order.
         """
-        self.results_cache = []
+        # Local per call: concurrent requests share this executor
+        results = []
         last_result = ""
 
         # Ensure plan is a list
         if not isinstance(plan, list):
             return ["Error: Invalid plan format. Expected a list of steps."]
 
+        group = []
         for step in plan:
             # Safety check: if step is not a dict, skip it
             if not isinstance(step, dict):
                 continue
 
             tool_name = step.get("tool")
-            args = step.get("args", {})
-            
             if not tool_name or tool_name == "step": # Blindaje contra el error 'step'
                 continue
 
-            # Substitute PREVIOUS_RESULT
-            processed_args = {}
-            if isinstance(args, dict):
-                for k, v in args.items():
-                    if isinstance(v, str) and "PREVIOUS_RESULT" in v:
-                        processed_args[k] = v.replace("PREVIOUS_RESULT", str(last_result))
-                    else:
-                        processed_args[k] = v
-            else:
-                processed_args = {}
-
-            tool_method = self._find_tool(tool_name)
-            if not tool_method:
-                error_msg = f"Error: Tool '{tool_name}' not found."
-                self.results_cache.append(error_msg)
-                last_result = error_msg
+            if self._can_join_group(step):
+                group.append(step)
                 continue
 
-            try:
-                if asyncio.iscoroutinefunction(tool_method):
-                    result = await tool_method(**processed_args)
-                else:
-                    result = tool_method(**processed_args)
-                
-                self.results_cache.append(str(result))
-                last_result = result
-            except Exception as e:
-                error_msg = f"Error executing {tool_name}: {str(e)}"
-                self.results_cache.append(error_msg)
-                last_result = error_msg
-
-        return self.results_cache
+            if group:
+                last_result = await self._run_group(group, last_result, results)
+                group = []
+            # Side effects (files, folders, code fixes) or a data dependency: run alone
+            last_result = await self._run_group([step], last_result, results)
+
+        if group:
+            await self._run_group(group, last_result, results)
+
+        return results
@@ -0,0 +1,123 @@
+"""
+Upload file classifier.
+
+Asks the LLM which storage category an uploaded file belongs to. Uploads that
+arrive within a short window of each other are classified together in a single
+LLM call, so a burst of uploads pays the per-request overhead once.
+"""
+import asyncio
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+CATEGORIES = frozenset({"datasets", "finance", "documents", "reports", "other"})
+
+# Extensions whose category is unambiguous skip the LLM entirely
+EXT_CATEGORIES = {
+    ".csv": "datasets",
+    ".tsv": "datasets",
+    ".parquet": "datasets",
+    ".pdf": "documents",
+    ".doc": "documents",
+    ".docx": "documents",
+    ".md": "reports",
+}
+
+# Classification requests arriving within this window share one LLM call
+CLASSIFY_WINDOW = 0.02
+MAX_CLASSIFY_BATCH = 32
+
+SINGLE_PROMPT = (
+    "You are a file librarian. Classify this file into ONE of these categories: "
+    "'datasets', 'finance', 'documents', 'reports', 'other'. "
+    "Respond ONLY with that single category word — nothing else. File name: '{filename}'"
+)
+
+BATCH_PROMPT = (
+    "You are a file librarian. Classify each file below into ONE of these categories: "
+    "'datasets', 'finance', 'documents', 'reports', 'other'. "
+    "Respond with one line per file in the form '<number>. <category>' — nothing else.\n"
+    "{files}"
+)
+
+_ANSWER_LINE_RE = re.compile(r"^\s*(\d+)\s*[.):-]\s*'?([A-Za-z]+)", re.MULTILINE)
+
+
+def _parse_category(answer: str) -> str:
+    """First word of a single-file answer, or 'other' if it isn't a category."""
+    words = answer.strip().lower().split()
+    if words and words[0] in CATEGORIES:
+        return words[0]
+    return "other"
+
+
+class FileClassifier:
+    """
+    Coalesces concurrent upload classifications into batched LLM calls.
+    The blocking LLM client runs in a worker thread, so classification
+    never stalls the event loop.
+    """
+
+    def __init__(self, llm):
+        self.llm = llm
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # In-flight batch tasks (the loop only keeps weak references to tasks)
+        self._inflight = set()
+
+    async def classify(self, filename: str) -> str:
+        """Category from the extension if unambiguous, otherwise from the next LLM batch"""
+        category = EXT_CATEGORIES.get(os.path.splitext(filename)[1].lower())
+        if category is not None:
+            return category
+
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((filename, future))
+        return await future
+
+    async def _run(self):
+        """Collect requests for up to CLASSIFY_WINDOW, then classify them together"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + CLASSIFY_WINDOW
+            while len(batch) < MAX_CLASSIFY_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Each batch is sent off as its own task so a slow LLM call doesn't
+            # hold back the requests queueing up behind it
+            task = asyncio.create_task(self._resolve(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _resolve(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            categories = await asyncio.to_thread(self._classify_batch, [name for name, _ in batch])
+        except Exception:
+            categories = ["other"] * len(batch)
+        for (_, future), category in zip(batch, categories):
+            if not future.done():
+                future.set_result(category)
+
+    def _classify_batch(self, filenames: List[str]) -> List[str]:
+        """One LLM call for all file names; unanswered entries fall back to 'other'"""
+        if len(filenames) == 1:
+            answer = self.llm.chat([{"role": "user", "content": SINGLE_PROMPT.format(filename=filenames[0])}])
+            return [_parse_category(answer)]
+
+        files = "\n".join(f"{i}. {name}" for i, name in enumerate(filenames, 1))
+        answer = self.llm.chat([{"role": "user", "content": BATCH_PROMPT.format(files=files)}])
+        by_index: Dict[int, str] = {}
+        for number, word in _ANSWER_LINE_RE.findall(answer):
+            by_index.setdefault(int(number), _parse_category(word))
+        return [by_index.get(i, "other") for i in range(1, len(filenames) + 1)]
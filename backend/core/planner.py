@@ -4,6 +4,12 @@ from typing import List, Dict, Any
 from core.interfaces import BasePlanner
 from prompts.planner_prompt import PLANNER_PROMPT
 
+# {tools} is the template's only field: split around it once and unescape the
+# literal braces, so building the prompt is a concatenation instead of a format
+_PROMPT_PREFIX, _PROMPT_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}") for part in PLANNER_PROMPT.split("{tools}")
+)
+
 
 class LLMPlanner(BasePlanner):
     """Uses an LLM to generate execution plans."""
@@ -20,7 +26,7 @@ class LLMPlanner(BasePlanner):
         Generate a raw plan string from the LLM.
         Returns the raw output (to be validated by PlanValidator).
         """
-        prompt = PLANNER_PROMPT.format(tools=tool_descriptions, user_input=user_input)
+        prompt = _PROMPT_PREFIX + tool_descriptions + _PROMPT_SUFFIX
         
         messages = [
             {"role": "system", "content": prompt},
@@ -1,7 +1,10 @@
 import os
+import re
 import asyncio
 import sys
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode, LLMConfig, BrowserConfig
 from crawl4ai.extraction_strategy import LLMExtractionStrategy
@@ -10,6 +13,22 @@ from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 
 os.environ["CRAWL4AI_LOG_LEVEL"] = "ERROR"
 
+# Límite de concurrencia por defecto: las páginas comparten un navegador ya arrancado
+MAX_CONCURRENT_PAGES = 8
+# Resultados recordados por (url, query, instrucción) durante la sesión
+RESULT_CACHE_SIZE = 128
+
+# Extracción por lotes: tamaño máximo del corpus concatenado por llamada al LLM
+# (holgado para un contexto de 4k tokens) y tokens de respuesta por página
+BATCH_CONTEXT_CHARS = 12000
+BATCH_TOKENS_PER_URL = 64
+BATCH_FORMAT = (
+    "\n\nThe input contains several pages, each starting with a line "
+    "'--- URL: <url> ---'. Treat each page as one block. Answer with the same "
+    "header line for every page, each followed by that page's response."
+)
+_URL_HEADER_RE = re.compile(r"^-{3} URL: (.+?) -{3}[ \t]*$", re.MULTILINE)
+
 
 class LLMFriendlyScraper:
     """
@@ -41,46 +60,234 @@ class LLMFriendlyScraper:
             api_token="sk-no-key",
             base_url="http://localhost:8080/v1"
         )
+        # Crawler persistente en su propio loop (ver _ensure_crawler_loop)
+        self._crawler = None
+        self._crawler_loop = None
+        self._crawler_lock = None
+        self._crawler_thread_lock = threading.Lock()
+        # Cliente OpenAI-compatible para la extracción por lotes (carga diferida)
+        self._llm_client = None
+        # LRU de páginas ya procesadas: {(url, query, hash(instrucción)): entrada}
+        self._cache: "OrderedDict[Tuple[str, Optional[str], int], Dict[str, str]]" = OrderedDict()
 
     def getInstruction(self,query):
         return f"Query: '{query}'\n\n" + self.instruction
 
+    def _ensure_crawler_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Event loop propio del crawler, en un hilo en segundo plano. Playwright
+        queda ligado al loop que lo arranca; así el navegador sobrevive a los
+        loops de quien llama (asyncio.run por petición, consola, MCP) y nunca
+        queda huérfano cuando uno de ellos termina.
+        """
+        with self._crawler_thread_lock:
+            if self._crawler_loop is None or self._crawler_loop.is_closed():
+                loop = asyncio.new_event_loop()
+
+                def run():
+                    loop.run_forever()
+                    loop.close()
+
+                threading.Thread(target=run, name="crawler-loop", daemon=True).start()
+                self._crawler_loop = loop
+                self._crawler_lock = None
+            return self._crawler_loop
+
+    async def _on_crawler_loop(self, coro):
+        """Ejecuta `coro` en el loop del crawler y espera el resultado desde el loop actual."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_crawler_loop())
+        return await asyncio.wrap_future(future)
+
+    async def _get_crawler(self) -> AsyncWebCrawler:
+        """
+        Devuelve el crawler persistente, arrancando el navegador solo una vez.
+        Solo se llama desde el loop del crawler (ver _on_crawler_loop).
+        """
+        if self._crawler_lock is None:
+            self._crawler_lock = asyncio.Lock()
+        async with self._crawler_lock:
+            if self._crawler is None:
+                crawler = AsyncWebCrawler(verbose=False)
+                await crawler.__aenter__()
+                self._crawler = crawler
+        return self._crawler
+
+    async def _arun(self, url: str, config: CrawlerRunConfig):
+        crawler = await self._get_crawler()
+        return await crawler.arun(url=url, config=config)
+
+    def _cache_get(self, key):
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+        return entry
+
+    def _cache_put(self, key, entry):
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        if len(self._cache) > RESULT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def _close_on_loop(self):
+        crawler, self._crawler = self._crawler, None
+        client, self._llm_client = self._llm_client, None
+        if client is not None:
+            await client.close()
+        if crawler is not None:
+            await crawler.__aexit__(None, None, None)
+
+    async def aclose(self):
+        """Cierra el navegador persistente y el cliente del LLM, desde cualquier loop (apagado del servidor)."""
+        loop = self._crawler_loop
+        if loop is None or loop.is_closed() or (self._crawler is None and self._llm_client is None):
+            return
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._close_on_loop(), loop))
+
+    def close(self, timeout: float = 10):
+        """
+        Cierra el navegador y el cliente del LLM y detiene el loop del crawler.
+        Síncrono, para llamarlo fuera de cualquier event loop (p.ej. al salir
+        de la consola).
+        """
+        loop = self._crawler_loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            if self._crawler is not None or self._llm_client is not None:
+                asyncio.run_coroutine_threadsafe(self._close_on_loop(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            self._crawler_loop = None
+
+    @staticmethod
+    def _fit_markdown(result) -> str:
+        md_obj = getattr(result, 'markdown', None)
+        if md_obj is not None and getattr(md_obj, 'fit_markdown', None):
+            return md_obj.fit_markdown.strip()
+        return ""
+
+    def _single_url_config(self, query: str, md_generator) -> CrawlerRunConfig:
+        """Configuración por URL con extracción por bloques (páginas que no caben en un lote)."""
+        strategy = LLMExtractionStrategy(
+            llm_config=self.llm_config,
+            extraction_type="block",
+            instruction=self.getInstruction(query),
+            chunk_token_threshold=800,
+            overlap_rate=0.2,
+            extra_args={
+                "temperature": 0.1,
+                "max_tokens": 50,
+                "top_p": 0.97,
+                "presence_penalty": 0.1
+            }
+        )
+        return CrawlerRunConfig(
+            markdown_generator=md_generator,
+            extraction_strategy=strategy,
+            cache_mode=CacheMode.ENABLED,
+            verbose=False
+        )
+
+    async def _extract_batched(self, query: str, markdowns: Dict[str, str], crawl_single) -> Dict[str, str]:
+        """
+        Extracción con LLM agrupando varias páginas por petición.
+        Las páginas se concatenan con cabeceras `--- URL: ... ---` en lotes de
+        hasta BATCH_CONTEXT_CHARS y cada lote es una sola llamada al servidor;
+        la respuesta se separa de nuevo por cabecera. Una página que por sí sola
+        no cabe en un lote usa la extracción por bloques de crawl4ai (crawl_single).
+        Devuelve {url: texto extraído}; las URLs sin respuesta útil no aparecen.
+        """
+        batches, batch, size = [], [], 0
+        oversized = []
+        for url, md in markdowns.items():
+            section = f"--- URL: {url} ---\n{md}"
+            if len(section) > BATCH_CONTEXT_CHARS:
+                oversized.append(url)
+                continue
+            if batch and size + len(section) > BATCH_CONTEXT_CHARS:
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append((url, section))
+            size += len(section) + 2
+        if batch:
+            batches.append(batch)
+
+        async def run_single(url):
+            result = await crawl_single(url)
+            content = getattr(result, 'extracted_content', None) or ""
+            return {url: content.strip()}
+
+        outputs = await asyncio.gather(
+            # El cliente HTTP del LLM vive en el loop del crawler, como el navegador
+            *(self._on_crawler_loop(self._complete_batch(query, b)) for b in batches),
+            *(run_single(url) for url in oversized),
+            return_exceptions=True,
+        )
+        extracted = {}
+        for out in outputs:
+            if isinstance(out, Exception):
+                print(f"[SCRAPER] ❌ LLM extraction failed: {out}", file=sys.stderr, flush=True)
+                continue
+            extracted.update(out)
+        return extracted
+
+    async def _complete_batch(self, query: str, batch: List[Tuple[str, str]]) -> Dict[str, str]:
+        """
+        Una llamada al servidor OpenAI-compatible para todas las páginas del lote.
+        Solo se llama desde el loop del crawler: el pool de httpx de AsyncOpenAI
+        queda ligado al loop que lo usa por primera vez.
+        """
+        if self._llm_client is None:
+            from openai import AsyncOpenAI
+            self._llm_client = AsyncOpenAI(base_url=self.llm_config.base_url, api_key=self.llm_config.api_token)
+
+        corpus = "\n\n".join(section for _, section in batch)
+        response = await self._llm_client.chat.completions.create(
+            model=self.llm_config.provider.split("/", 1)[-1],
+            messages=[
+                {"role": "system", "content": self.getInstruction(query) + BATCH_FORMAT},
+                {"role": "user", "content": corpus},
+            ],
+            temperature=0.1,
+            max_tokens=BATCH_TOKENS_PER_URL * len(batch),
+            top_p=0.97,
+            presence_penalty=0.1,
+        )
+        text = response.choices[0].message.content or ""
+
+        # Separar la respuesta por cabecera; solo URLs del lote
+        urls = {url for url, _ in batch}
+        extracted = {}
+        parts = _URL_HEADER_RE.split(text)
+        for url, body in zip(parts[1::2], parts[2::2]):
+            url, body = url.strip(), body.strip()
+            if url in urls and body and body != "[EMPTY]":
+                extracted[url] = body
+        return extracted
+
     async def scrape_multiple(
         self,
         urls: List[str],
         max_urls: int = 5,
         query: Optional[str] = None,
-        max_concurrent: int = 3
+        max_concurrent: Optional[int] = None
     ) -> List[Dict[str, str]]:
 
-        urls = urls[:max_urls]
-        print(f"[SCRAPER] Scraping {len(urls)} URLs",
+        # URLs repetidas (frecuentes en los planes) se procesan una sola vez
+        urls = list(dict.fromkeys(urls))[:max_urls]
+        instruction_key = hash(self.instruction)
+        cached = {}
+        for url in urls:
+            entry = self._cache_get((url, query, instruction_key))
+            if entry is not None:
+                cached[url] = entry
+        pending = [url for url in urls if url not in cached]
+
+        if max_concurrent is None:
+            max_concurrent = max(1, min(len(pending), MAX_CONCURRENT_PAGES))
+        print(f"[SCRAPER] Scraping {len(pending)} URLs ({len(cached)} cached)",
               file=sys.stderr, flush=True)
 
-        # ---------- LLM STRATEGY ----------
-        strategy = None
-        if query:
-            print(f"[SCRAPER] LLM extraction enabled for: {query}",
-                  file=sys.stderr, flush=True)
-            
-            llm_config = self.llm_config
-            instruction = self.getInstruction(query)
-            
-
-            strategy = LLMExtractionStrategy(
-                llm_config=llm_config,
-                extraction_type="block",
-                instruction=instruction,
-                chunk_token_threshold=800,
-                overlap_rate=0.2,
-                extra_args={
-                    "temperature": 0.1,
-                    "max_tokens": 50,
-                    "top_p": 0.97,
-                    "presence_penalty": 0.1
-                }
-            )
-        
         # ---------- CONTENT FILTER & MARKDOWN ----------
         pruning_filter = PruningContentFilter(threshold=0.48)
         md_generator = DefaultMarkdownGenerator(
@@ -89,27 +296,27 @@ class LLMFriendlyScraper:
         )
 
         # ---------- CRAWL CONFIG ----------
+        # Fase 1: solo markdown; la extracción con LLM se hace después, por lotes
         crawl_config = CrawlerRunConfig(
             markdown_generator=md_generator,
-            extraction_strategy=strategy,
             cache_mode=CacheMode.ENABLED, 
             verbose = False
         )
 
-        
-        async with AsyncWebCrawler(verbose=False) as crawler:
+        results = []
+        if pending:
             # Opcional: limitar concurrencia con semáforo
             semaphore = asyncio.Semaphore(max_concurrent)
 
-            async def crawl_one(url):
+            async def crawl_one(url, config=crawl_config):
                 async with semaphore:
-                    return await crawler.arun(url=url, config=crawl_config)
+                    return await self._on_crawler_loop(self._arun(url, config))
 
-            tasks = [crawl_one(url) for url in urls]
+            tasks = [crawl_one(url) for url in pending]
             results = await asyncio.gather(*tasks, return_exceptions=True) 
 
-        scraped: List[Dict[str, str]] = []
-        for url, result in zip(urls, results):
+        pages = {}
+        for url, result in zip(pending, results):
             if isinstance(result, Exception):
                 print(f"[SCRAPER] ❌ Failed {url}: {result}", file=sys.stderr, flush=True)
                 continue
@@ -118,34 +325,79 @@ class LLMFriendlyScraper:
             if not result.success:
                 print(f"[SCRAPER] ❌ Crawl not successful for {url}", file=sys.stderr, flush=True)
                 continue
+            pages[url] = result
 
+        # ---------- LLM EXTRACTION (fase 2) ----------
+        extracted = {}
+        if query and pages:
+            print(f"[SCRAPER] LLM extraction enabled for: {query}",
+                  file=sys.stderr, flush=True)
+            markdowns = {url: self._fit_markdown(result) for url, result in pages.items()}
+            extracted = await self._extract_batched(
+                query,
+                {url: md for url, md in markdowns.items() if md},
+                lambda url: crawl_one(url, self._single_url_config(query, md_generator)),
+            )
+
+        for url, result in pages.items():
             content_to_use = ""
 
             # 1. Contenido extraído por LLM (si se usó)
-            if strategy and hasattr(result, 'extracted_content') and result.extracted_content:
-                llm_output = result.extracted_content.strip()
-                if llm_output and len(llm_output) >= 5:
-                    content_to_use = llm_output
-                    print(f"[SCRAPER] ✓ LLM extracted from {url}", file=sys.stderr, flush=True)
+            llm_output = extracted.get(url, "")
+            if llm_output and len(llm_output) >= 5:
+                content_to_use = llm_output
+                print(f"[SCRAPER] ✓ LLM extracted from {url}", file=sys.stderr, flush=True)
 
             # 2. Fallback a markdown filtrado
-            if not content_to_use and hasattr(result, 'markdown'):
-                md_obj = result.markdown
-                if hasattr(md_obj, 'fit_markdown') and md_obj.fit_markdown:
-                    markdown = md_obj.fit_markdown.strip()
-                    if len(markdown) >= 50:
-                        content_to_use = markdown
-                        print(f"[SCRAPER] ↳ Using filtered markdown from {url}", file=sys.stderr, flush=True)
+            if not content_to_use:
+                markdown = self._fit_markdown(result)
+                if len(markdown) >= 50:
+                    content_to_use = markdown
+                    print(f"[SCRAPER] ↳ Using filtered markdown from {url}", file=sys.stderr, flush=True)
 
             if content_to_use:
-                scraped.append({
+                entry = {
                     "url": url,
                     "title": result.metadata.get("title", "Untitled") if hasattr(result, 'metadata') else "Untitled",
                     "markdown": content_to_use,
                     "success": True
-                })
+                }
+                cached[url] = entry
+                self._cache_put((url, query, instruction_key), entry)
             else:
                 print(f"[SCRAPER] ✗ No valid content from {url}", file=sys.stderr, flush=True)
 
+        # Orden original; páginas espejo con el mismo contenido se omiten
+        scraped: List[Dict[str, str]] = []
+        seen_content = set()
+        for url in urls:
+            entry = cached.get(url)
+            if entry is not None and entry["markdown"] not in seen_content:
+                seen_content.add(entry["markdown"])
+                scraped.append(entry)
+
         print(f"[SCRAPER] Done: {len(scraped)}/{len(urls)} pages OK", file=sys.stderr, flush=True)
-        return scraped
\ No newline at end of file
+        return scraped
+
+
+_shared_scraper: Optional[LLMFriendlyScraper] = None
+
+
+def get_scraper() -> LLMFriendlyScraper:
+    """Scraper compartido por el proceso, para reutilizar su navegador entre llamadas."""
+    global _shared_scraper
+    if _shared_scraper is None:
+        _shared_scraper = LLMFriendlyScraper()
+    return _shared_scraper
+
+
+async def close_scraper():
+    """Cierra el navegador del scraper compartido, si llegó a arrancarse."""
+    if _shared_scraper is not None:
+        await _shared_scraper.aclose()
+
+
+def close_scraper_sync(timeout: float = 10):
+    """Como close_scraper, pero llamable desde código síncrono (salida de la consola)."""
+    if _shared_scraper is not None:
+        _shared_scraper.close(timeout)
@@ -1,7 +1,23 @@
 """Professional LLM Summarizer implementation."""
+import asyncio
 from typing import List
 from core.interfaces import BaseSummarizer
 
+# Prompt budget for tool output: per result and for the whole RAW DATA block
+MAX_RESULT_CHARS = 2000
+MAX_RESULTS_CHARS = 32000
+
+SYSTEM_MSG = (
+    "You are a Senior Intelligence Analyst. You have been provided with REAL-TIME DATA "
+    "already fetched from the internet. Your job is to deliver a professional report. "
+    "\n\nSTYLE RULES:\n"
+    "1. USE LaTeX for ALL mathematical notation and statistics (e.g. use $\\mu$, $\\sigma$, $E=mc^2$).\n"
+    "2. Wrap LaTeX blocks in double dollar signs $$ ... $$ for clarity.\n"
+    "3. Use professional, clean Markdown with clear headers and bullet points.\n"
+    "4. NEVER use filler phrases like 'As an AI language model' or 'I don't have access to live data'.\n"
+    "5. The data provided is REAL. Trust it and summarize it elegantly."
+)
+
 class LLMSummarizer(BaseSummarizer):
     """Refined summarizer for high-quality, professional reports."""
     
@@ -15,21 +31,20 @@ class LLMSummarizer(BaseSummarizer):
         if not valid_results:
             return "Unable to process the request due to missing tool data. Please try a more specific topic."
         
-        results_text = chr(10).join(f'--- Tool Result {i+1} ---\n{r}' for i, r in enumerate(valid_results))
-        
-        system_msg = (
-            "You are a Senior Intelligence Analyst. You have been provided with REAL-TIME DATA "
-            "already fetched from the internet. Your job is to deliver a professional report. "
-            "\n\nSTYLE RULES:\n"
-            "1. USE LaTeX for ALL mathematical notation and statistics (e.g. use $\\mu$, $\\sigma$, $E=mc^2$).\n"
-            "2. Wrap LaTeX blocks in double dollar signs $$ ... $$ for clarity.\n"
-            "3. Use professional, clean Markdown with clear headers and bullet points.\n"
-            "4. NEVER use filler phrases like 'As an AI language model' or 'I don't have access to live data'.\n"
-            "5. The data provided is REAL. Trust it and summarize it elegantly."
-        )
+        parts = []
+        total = 0
+        for i, r in enumerate(valid_results):
+            chunk = f"--- Tool Result {i+1} ---\n{r[:MAX_RESULT_CHARS]}"
+            total += len(chunk) + 1
+            if total > MAX_RESULTS_CHARS:
+                parts.append("...[truncated]")
+                break
+            parts.append(chunk)
+        results_text = "\n".join(parts)
         
         messages = [
-            {"role": "system", "content": system_msg},
+            {"role": "system", "content": SYSTEM_MSG},
             {"role": "user", "content": f"USER INQUIRY: {task}\n\nRAW DATA GATHERED:\n{results_text}"}
         ]
-        return self.llm.chat(messages, temperature=0.3)
+        # The client is blocking; keep the event loop free while it generates
+        return await asyncio.to_thread(self.llm.chat, messages, temperature=0.3)
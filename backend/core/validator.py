@@ -6,6 +6,22 @@ from typing import List, Dict, Any
 from core.interfaces import BasePlanValidator
 from prompts.validator_prompt import VALIDATOR_PROMPT
 
+try:
+    import json_repair
+except ImportError:
+    json_repair = None
+
+_FENCE_RE = re.compile(r"```(?:json)?")
+# "text " + PREVIOUS_RESULT (+ " more")  ->  "PREVIOUS_RESULT"
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_CONCAT_RE = re.compile(
+    rf'(?:{_STRING}\s*\+\s*)+"?PREVIOUS_RESULT"?(?:\s*\+\s*{_STRING})*'
+    rf'|"?PREVIOUS_RESULT"?(?:\s*\+\s*{_STRING})+'
+)
+# An unquoted placeholder used as a JSON value
+_BARE_RE = re.compile(r'([:\[,]\s*)PREVIOUS_RESULT(?=\s*[,\]}])')
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+
 
 class LLMPlanValidator(BasePlanValidator):
     """Uses an LLM to validate and normalize plans."""
@@ -28,18 +44,48 @@ class LLMPlanValidator(BasePlanValidator):
         except json.JSONDecodeError:
             return []
 
+    @staticmethod
+    def _is_plan(steps) -> bool:
+        """Basic schema check: a non-empty list of steps with tool and args."""
+        return (
+            isinstance(steps, list) and len(steps) > 0
+            and all(isinstance(step, dict) and 'tool' in step and 'args' in step for step in steps)
+        )
+
+    def _normalize(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Deterministic version of the VALIDATOR_PROMPT rules: drop markdown
+        fences, collapse string concatenations with PREVIOUS_RESULT into the
+        placeholder, drop trailing commas, then parse (json_repair if installed).
+        """
+        text = _FENCE_RE.sub("", text)
+        text = _CONCAT_RE.sub('"PREVIOUS_RESULT"', text)
+        text = _BARE_RE.sub(r'\1"PREVIOUS_RESULT"', text)
+        text = _TRAILING_COMMA_RE.sub(r"\1", text)
+        steps = self._extract_json(text)
+        if not steps and json_repair is not None:
+            try:
+                steps = json_repair.loads(text)
+            except Exception:
+                steps = []
+        return steps
+
     async def validate(self, raw_plan: str) -> List[Dict[str, Any]]:
         """
         Validate raw plan.
         1. Fast Path: Try to parse directly.
-        2. Slow Path: If parse fails, ask LLM to fix it.
+        2. Local normalization of fences, concatenations and trailing commas.
+        3. Slow Path: If both fail, ask LLM to fix it.
         """
         # FAST PATH: Try direct parse first to avoid LLM rewriting (and breaking) args
         params_fast = self._extract_json(raw_plan)
-        if params_fast and isinstance(params_fast, list) and len(params_fast) > 0:
-            # Basic schema check
-            if all('tool' in step and 'args' in step for step in params_fast):
-                return params_fast
+        if self._is_plan(params_fast):
+            return params_fast
+
+        # LOCAL PATH: the usual defects are fixable without an LLM round trip
+        normalized = self._normalize(raw_plan)
+        if self._is_plan(normalized):
+            return normalized
 
         # SLOW PATH: LLM Validation
         messages = [
@@ -1,10 +1,13 @@
 import os
 import sys
+import asyncio
 import threading
-import uvicorn
 import inspect
+import importlib.util
 from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
+from typing import Optional
 
 # Add current directory to sys.path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,15 +23,24 @@ from core.planner import LLMPlanner
 from core.validator import LLMPlanValidator
 from core.executor import ToolExecutor
 from core.summarizer import LLMSummarizer
-from core.data_analyst import DataAnalyst
 from core.agent_orchestrator import AgentOrchestrator
+from core.file_classifier import FileClassifier
+from core.scraper import close_scraper, close_scraper_sync
 from tool_registry import register_tools
 from mcp.server.fastmcp import FastMCP
 
 # Import audio routes
 from audio_routes import router as audio_router
 
-app = FastAPI(title="MCPDESK Backend")
+try:
+    import orjson
+    _ResponseClass = ORJSONResponse
+except ImportError:
+    _ResponseClass = JSONResponse
+
+# orjson encodes the /plot records and /files tree in C, and turns NaN into null
+# instead of failing the response
+app = FastAPI(title="MCPDESK Backend", default_response_class=_ResponseClass)
 
 # Include audio routes
 app.include_router(audio_router)
@@ -49,31 +61,65 @@ STORAGE_DIR = os.path.join(workspace_path, "storage")
 os.makedirs(STORAGE_DIR, exist_ok=True)
 
 # Initialize modular handlers
-data_analyst = DataAnalyst(llm, STORAGE_DIR)
+file_classifier = FileClassifier(llm)
 
-def get_tool_descriptions():
+# Data analyst (lazy loaded: pulls in pyarrow and starts the storage watcher)
+_data_analyst = None
+
+
+def get_data_analyst():
+    """Create the DataAnalyst on the first /plot or /describe command."""
+    global _data_analyst
+    if _data_analyst is None:
+        from core.data_analyst import DataAnalyst
+        _data_analyst = DataAnalyst(llm, STORAGE_DIR)
+    return _data_analyst
+
+def _build_tool_descriptions(instances) -> str:
     """Build a text description of all registered tools."""
-    descriptions = []
-    for category, instance in tool_instances.items():
-        for name, method in inspect.getmembers(instance, inspect.ismethod):
-            if hasattr(method, '_is_tool') and method._is_tool:
-                doc = inspect.getdoc(method) or "No description"
-                sig = inspect.signature(method)
-                params = str(sig)
-                descriptions.append(f"- {name}{params}: {doc}")
-    return "\n".join(descriptions)
+    return "\n".join(
+        f"- {name}{inspect.signature(method)}: {inspect.getdoc(method) or 'No description'}"
+        for instance in instances.values()
+        for name, method in inspect.getmembers(instance, inspect.ismethod)
+        if getattr(method, '_is_tool', False)
+    )
+
+# The toolset is fixed once register_tools has run, so reflect over it only once
+TOOL_DESCRIPTIONS = _build_tool_descriptions(tool_instances)
+
+def get_tool_descriptions():
+    return TOOL_DESCRIPTIONS
 
 orchestrator = AgentOrchestrator(llm, planner, executor, summarizer, get_tool_descriptions)
 
+ANALYST_SYSTEM_MSG = "You are a Global Senior Intelligence Analyst. INTERPRET data, look for 'the why', and respond in professional Markdown."
+
 class CommandRequest(BaseModel):
     command: str
 
+# Event loop uvicorn serves on; the console submits its queries to it too, so
+# the crawler and LLM connections opened by one are reused by the other
+_api_loop: Optional[asyncio.AbstractEventLoop] = None
+_api_ready = threading.Event()
+
+@app.on_event("startup")
+async def startup():
+    global _api_loop
+    _api_loop = asyncio.get_running_loop()
+    _api_ready.set()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_scraper()
+
 @app.get("/")
 async def root():
     return {"status": "online", "name": "MCPDESK Backend"}
 
 # ── File Upload with AI Classifier ─────────────────────────────────────────────
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 @app.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     """
@@ -81,30 +127,19 @@ async def upload_file(file: UploadFile = File(...)):
     The LLM classifies the file by name/extension and saves it into the
     appropriate subfolder (datasets/, finance/, documents/, reports/, other/).
     """
-    contents = await file.read()
     filename = file.filename
 
-    # AI-based file classification
-    classification_prompt = (
-        f"You are a file librarian. Classify this file into ONE of these categories: "
-        f"'datasets', 'finance', 'documents', 'reports', 'other'. "
-        f"Respond ONLY with that single category word — nothing else. File name: '{filename}'"
-    )
-    try:
-        category = llm.chat([{"role": "user", "content": classification_prompt}])
-        allowed = {"datasets", "finance", "documents", "reports", "other"}
-        category = category.strip().lower().split()[0]
-        if category not in allowed:
-            category = "other"
-    except Exception:
-        category = "other"
+    # Classified by extension, or by the LLM (batched with concurrent uploads)
+    category = await file_classifier.classify(filename)
 
     dest_dir = os.path.join(STORAGE_DIR, category)
     os.makedirs(dest_dir, exist_ok=True)
     file_path = os.path.join(dest_dir, filename)
     try:
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        # Copy chunk by chunk (never holds the whole upload in memory)
+        with open(file_path, "wb", buffering=UPLOAD_CHUNK_SIZE) as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
         return {
             "status": "success",
             "filename": filename,
@@ -117,36 +152,68 @@ async def upload_file(file: UploadFile = File(...)):
 
 # ── Hierarchical File Tree ──────────────────────────────────────────────────────
 
-def _build_tree(directory: str, rel_base: str = "") -> list:
+def _build_tree(directory: str, rel_base: str = "", mtimes: Optional[dict] = None) -> list:
     """
-    Recursively scan `directory` and return a list of nodes compatible with
+    Scan `directory` and return a list of nodes compatible with
     NiceGUI's ui.tree format: [{"id": ..., "label": ..., "children": [...]}, ...]
     Hidden directories (starting with '.') such as .cache are excluded.
+    If `mtimes` is given, each scanned directory's mtime is recorded in it.
     """
     nodes = []
-    try:
-        entries = sorted(
-            os.scandir(directory),
-            key=lambda e: (not e.is_dir(), e.name.lower())
-        )
-        for entry in entries:
-            if entry.name.startswith("."):
-                continue  # Skip .cache and other hidden dirs
-            rel_path = os.path.join(rel_base, entry.name) if rel_base else entry.name
-            if entry.is_dir():
-                children = _build_tree(entry.path, rel_path)
-                nodes.append({"id": rel_path, "label": entry.name, "children": children})
+    # Each directory's node list is attached to its parent before it is filled,
+    # so an explicit stack replaces the recursion
+    stack = [(directory, rel_base, nodes)]
+    while stack:
+        path, base, children = stack.pop()
+        try:
+            if mtimes is not None:
+                # Taken before listing, so a change during the scan invalidates the result
+                mtimes[path] = os.stat(path).st_mtime_ns
+            # is_dir(follow_symlinks=False) is answered from the directory listing
+            # itself, with no extra stat per entry (and no following symlink loops)
+            with os.scandir(path) as it:
+                entries = [(not e.is_dir(follow_symlinks=False), e.name.lower(), e.name, e)
+                           for e in it if not e.name.startswith(".")]
+        except PermissionError:
+            continue
+        # Names are unique within a directory, so the DirEntry itself is never compared
+        entries.sort()
+        for is_file, _, _, entry in entries:
+            rel_path = os.path.join(base, entry.name) if base else entry.name
+            if not is_file:
+                node = {"id": rel_path, "label": entry.name, "children": []}
+                stack.append((entry.path, rel_path, node["children"]))
             else:
-                nodes.append({"id": rel_path, "label": entry.name})
-    except PermissionError:
-        pass
+                node = {"id": rel_path, "label": entry.name}
+            children.append(node)
     return nodes
 
 
+_tree_cache = {"mtimes": None, "tree": None}
+
+def _storage_tree() -> list:
+    """
+    File tree of storage/, rebuilt only when a directory in it changed.
+    The tree lists names only, and adding, removing or renaming an entry
+    updates its parent directory's mtime, so directory mtimes are enough.
+    """
+    mtimes = _tree_cache["mtimes"]
+    if mtimes is not None:
+        try:
+            if all(os.stat(d).st_mtime_ns == m for d, m in mtimes.items()):
+                return _tree_cache["tree"]
+        except OSError:
+            pass
+    mtimes = {}
+    tree = _build_tree(STORAGE_DIR, mtimes=mtimes)
+    _tree_cache["mtimes"], _tree_cache["tree"] = mtimes, tree
+    return tree
+
+
 @app.get("/files")
 async def list_files():
     """Return a hierarchical file tree of storage/ (NiceGUI ui.tree compatible)."""
-    tree = _build_tree(STORAGE_DIR)
+    tree = _storage_tree()
     return {"tree": tree}
 
 
@@ -163,13 +230,18 @@ async def handle_command(request: CommandRequest):
     try:
         # 1. IMMEDIATE ANALYTICAL CHECK (plain text, no slash)
         if not cmd.startswith("/") and len(cmd.split()) > 2:
-            system_msg = "You are a Global Senior Intelligence Analyst. INTERPRET data, look for 'the why', and respond in professional Markdown."
-            result = llm.chat([{"role": "system", "content": system_msg}, {"role": "user", "content": cmd}])
+            # The client is blocking; run it off the event loop so other requests proceed
+            result = await asyncio.to_thread(
+                llm.chat, [{"role": "system", "content": ANALYST_SYSTEM_MSG}, {"role": "user", "content": cmd}]
+            )
             return {"type": "text", "content": result, "mode": getattr(llm, "mode", "unknown")}
 
         # 2. DATA ANALYST (Pandas, Vega-Lite JSON logic)
         if cmd.startswith("/plot") or cmd.startswith("/describe"):
-            return data_analyst.handle_data_command(cmd)
+            result = await asyncio.to_thread(get_data_analyst().handle_data_command, cmd)
+            # Returned as a ready Response: FastAPI would otherwise walk every plot
+            # record through jsonable_encoder before the encoder even sees it
+            return _ResponseClass(result)
 
         # 3. AUTONOMOUS AGENT ORCHESTRATION (Planner -> Executor -> Summarizer)
         return await orchestrator.execute_query(cmd)
@@ -181,15 +253,26 @@ async def handle_command(request: CommandRequest):
 # ── Console & Server Bootstrap ──────────────────────────────────────────────────
 
 def run_console():
-    """Interactive console."""
+    """
+    Interactive console.
+    Queries run on the API's event loop when it is up; otherwise on one
+    console loop kept for the whole session rather than a new one per query.
+    """
     print("--- MCPDESK Console ---")
+    _api_ready.wait(timeout=10)
+    console_loop = None
     while True:
         try:
             user_input = input("MCPDESK> ")
             if user_input.lower() in ["exit", "quit"]:
                 break
-            import asyncio
-            response = asyncio.run(orchestrator.execute_query(user_input))
+            query = orchestrator.execute_query(user_input)
+            if _api_loop is not None and _api_loop.is_running():
+                response = asyncio.run_coroutine_threadsafe(query, _api_loop).result()
+            else:
+                if console_loop is None:
+                    console_loop = asyncio.new_event_loop()
+                response = console_loop.run_until_complete(query)
             print(f"[{llm.mode.upper()}]\n{response.get('content')}")
         except EOFError:
             break
@@ -198,10 +281,19 @@ def run_console():
 
 
 def start_api():
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import uvicorn
+    # uvloop and httptools (uvicorn[standard]) where available; uvloop has no Windows build
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop, http=http)
 
 
 if __name__ == "__main__":
     api_thread = threading.Thread(target=start_api, daemon=True)
     api_thread.start()
-    run_console()
+    try:
+        run_console()
+    finally:
+        # The API thread is a daemon and its shutdown hook won't run on exit,
+        # so close the shared browser on its loop before the process ends
+        close_scraper_sync()
@@ -1,7 +1,5 @@
 import os
 import sys
-import inspect
-import functools
 from mcp.server.fastmcp import FastMCP
 
 from tools.system_tools import SystemTools
@@ -27,22 +25,11 @@ def register_tools(mcp: FastMCP, base_path: str):
     }
 
     for category, instance in tool_instances.items():
-        for name, method in inspect.getmembers(instance, inspect.ismethod):
-            if not hasattr(method, '_is_tool') or not method._is_tool:
-                continue
-            
-            # Create a proper wrapper that preserves async nature
-            if inspect.iscoroutinefunction(method):
-                @functools.wraps(method)
-                async def async_wrapper(*args, _bound_method=method, **kwargs):
-                    return await _bound_method(*args, **kwargs)
-                mcp.tool()(async_wrapper)
-            else:
-                @functools.wraps(method)
-                def sync_wrapper(*args, _bound_method=method, **kwargs):
-                    return _bound_method(*args, **kwargs)
-                mcp.tool()(sync_wrapper)
-            
+        # Names collected by the @tool() decorator at class creation
+        for name in getattr(type(instance), "__tools__", ()):
+            # Bound methods already carry the right signature (no `self`) and
+            # async-ness, so they are registered as-is
+            mcp.tool()(getattr(instance, name))
             sys.stderr.write(f"  Registered: {name}\n")
     
     return tool_instances
@@ -0,0 +1,107 @@
+"""
+Backtest kernels
+Bar-by-bar strategy loops over plain float64 arrays (Numba-compiled when
+available). Each kernel returns the final capital plus the trades as parallel
+arrays: bar index, side (+1 buy, -1 sell), price and portfolio value.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in: the kernels run as plain Python over NumPy arrays"""
+        def wrap(fn):
+            return fn
+        return wrap
+
+BUY = 1
+SELL = -1
+
+# Position states (sma_crossover_loop goes flat "short" after a crossover sell)
+_FLAT = 0
+_LONG = 1
+_SHORT = -1
+
+
+@njit(cache=True)
+def sma_crossover_loop(close, sma_short, sma_long, capital, start):
+    """Long while the short SMA is above the long SMA, from bar `start` on"""
+    n = close.size
+    idx = np.empty(2 * n, dtype=np.int64)
+    side = np.empty(2 * n, dtype=np.int8)
+    price = np.empty(2 * n, dtype=np.float64)
+    value = np.empty(2 * n, dtype=np.float64)
+    k = 0
+    shares = 0.0
+    position = _FLAT
+
+    for i in range(start, n):
+        p = close[i]
+        if sma_short[i] > sma_long[i] and position != _LONG:
+            if position == _SHORT:
+                capital = shares * p
+                shares = 0.0
+                idx[k], side[k], price[k], value[k] = i, SELL, p, capital
+                k += 1
+            shares = capital / p
+            capital = 0.0
+            position = _LONG
+            idx[k], side[k], price[k], value[k] = i, BUY, p, shares * p
+            k += 1
+        elif sma_short[i] < sma_long[i] and position == _LONG:
+            capital = shares * p
+            idx[k], side[k], price[k], value[k] = i, SELL, p, capital
+            k += 1
+            shares = 0.0
+            position = _SHORT
+
+    if position == _LONG:
+        capital = shares * close[n - 1]
+    return capital, idx[:k], side[:k], price[:k], value[:k]
+
+
+@njit(cache=True)
+def _band_loop(close, signal, lower, upper, capital, start):
+    """Buy when signal drops below `lower`, sell when it rises above `upper`"""
+    n = close.size
+    idx = np.empty(n, dtype=np.int64)
+    side = np.empty(n, dtype=np.int8)
+    price = np.empty(n, dtype=np.float64)
+    value = np.empty(n, dtype=np.float64)
+    k = 0
+    shares = 0.0
+    position = _FLAT
+
+    for i in range(start, n):
+        p = close[i]
+        if signal[i] < lower[i] and position != _LONG:
+            shares = capital / p
+            capital = 0.0
+            position = _LONG
+            idx[k], side[k], price[k], value[k] = i, BUY, p, shares * p
+            k += 1
+        elif signal[i] > upper[i] and position == _LONG:
+            capital = shares * p
+            idx[k], side[k], price[k], value[k] = i, SELL, p, capital
+            k += 1
+            shares = 0.0
+            position = _FLAT
+
+    if position == _LONG:
+        capital = shares * close[n - 1]
+    return capital, idx[:k], side[:k], price[:k], value[:k]
+
+
+@njit(cache=True)
+def rsi_loop(close, rsi, capital, start, oversold=30.0, overbought=70.0):
+    """Buy when RSI is oversold, sell when it turns overbought"""
+    n = close.size
+    return _band_loop(close, rsi, np.full(n, oversold), np.full(n, overbought), capital, start)
+
+
+@njit(cache=True)
+def bollinger_loop(close, bb_upper, bb_lower, capital, start):
+    """Buy below the lower band, sell above the upper band"""
+    return _band_loop(close, close, bb_lower, bb_upper, capital, start)
@@ -0,0 +1,55 @@
+"""
+On-disk TTL cache
+JSON files keyed by an md5 of the cache key, each holding {"ts": ..., "data": ...}.
+Used for read-mostly upstream data (company info, CoinGecko prices, fitted
+forecast models) that stays valid for minutes to a day and survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.path.join(_PROJECT_ROOT, ".cache", "tools")
+
+
+class FileCache:
+    """
+    Small JSON file cache with a per-instance time-to-live.
+    A missing, expired or unreadable entry is simply a miss.
+    """
+
+    def __init__(self, namespace: str, ttl: float, directory: str = CACHE_DIR):
+        self.directory = os.path.join(directory, namespace)
+        self.ttl = ttl
+
+    def _path(self, key) -> str:
+        digest = hashlib.md5(json.dumps(key, default=str).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".json")
+
+    def get(self, key) -> Optional[Any]:
+        """Cached data for `key`, or None if absent or older than the TTL"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("ts", 0) > self.ttl:
+            return None
+        return entry.get("data")
+
+    def set(self, key, data: Any):
+        """Store `data` (JSON-serializable; other values are stringified) under `key`"""
+        try:
+            payload = json.dumps({"ts": time.time(), "data": data}, default=str)
+            os.makedirs(self.directory, exist_ok=True)
+            # Write-then-rename so a concurrent reader never sees a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError):
+            pass
@@ -0,0 +1,53 @@
+"""
+Indicator kernels
+Recursive indicators that need a full pass over the series (Numba-compiled
+when available). Window indicators only read the tail.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _ema_kernel(x, alpha):
+        out = np.empty(x.size, dtype=np.float64)
+        prev = np.nan
+        for i in range(x.size):
+            v = x[i]
+            if np.isnan(v):
+                out[i] = prev
+            elif np.isnan(prev):
+                prev = v
+                out[i] = v
+            else:
+                prev = prev + alpha * (v - prev)
+                out[i] = prev
+        return out
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average, as pandas' ewm(span=span, adjust=False).mean().
+
+    Args:
+        x: 1-D float64 array
+        span: EMA span; alpha = 2 / (span + 1)
+
+    Returns:
+        float64 array of the same length
+    """
+    if njit is not None:
+        return _ema_kernel(x, 2.0 / (span + 1.0))
+    # pandas' compiled ewm beats an interpreted loop
+    return pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def tail_mean(x: np.ndarray, window: int) -> float:
+    """Mean of the last `window` values, NaN if the series is shorter"""
+    return x[-window:].mean() if x.size >= window else np.nan
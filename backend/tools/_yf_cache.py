@@ -0,0 +1,96 @@
+"""
+Shared yfinance cache
+Process-wide memo of yf.Ticker objects and price histories, so tools asked
+about the same ticker in a row (indicators, then a backtest) hit Yahoo once.
+Entries live in the current CACHE_TTL time bucket, i.e. for at most CACHE_TTL
+seconds, which also bounds how stale Ticker.info and news can get.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List
+
+import pandas as pd
+import yfinance as yf
+
+CACHE_TTL = 300
+
+# Upper bound on concurrent Yahoo requests for a multi-ticker fetch
+MAX_FETCH_WORKERS = 16
+
+
+class _NotCached(Exception):
+    """Carries a result out of an lru_cache'd call without caching it"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+
+def _bucket() -> int:
+    return int(time.monotonic() // CACHE_TTL)
+
+
+@lru_cache(maxsize=256)
+def _ticker(symbol: str, bucket: int) -> yf.Ticker:
+    return yf.Ticker(symbol)
+
+
+@lru_cache(maxsize=512)
+def _history(symbol: str, period: str, bucket: int) -> pd.DataFrame:
+    df = _ticker(symbol, bucket).history(period=period)
+    if df.empty:
+        # Usually a transient Yahoo failure or a typo; don't pin it for CACHE_TTL
+        raise _NotCached(df)
+    return df
+
+
+def ticker(symbol: str) -> yf.Ticker:
+    """Cached yf.Ticker for `symbol`"""
+    return _ticker(symbol, _bucket())
+
+
+def history(symbol: str, period: str) -> pd.DataFrame:
+    """
+    Cached Ticker(symbol).history(period=period).
+
+    Args:
+        symbol: Ticker symbol, already normalised (stripped, upper-case)
+        period: yfinance period string, e.g. "6mo"
+
+    Returns:
+        A copy of the cached frame, so callers may modify it in place
+    """
+    try:
+        return _history(symbol, period, _bucket()).copy()
+    except _NotCached as e:
+        return e.df
+
+
+def _close(symbol: str, period: str) -> pd.Series:
+    df = history(symbol, period)
+    if df.empty or "Close" not in df:
+        return pd.Series(dtype="float64", name=symbol)
+    close = df["Close"].rename(symbol)
+    # Calendar dates, as yf.download gives: exchanges in different time zones
+    # must line up on the same day
+    close.index = close.index.tz_localize(None).normalize()
+    return close
+
+
+def closes(symbols: List[str], period: str) -> pd.DataFrame:
+    """
+    Closing prices of several tickers, fetched in parallel through the cache.
+    Drop-in for yf.download(symbols, period=period)["Close"]: one column per
+    symbol (all-NaN if Yahoo has no data for it), outer-joined on date.
+
+    Args:
+        symbols: Ticker symbols, already normalised
+        period: yfinance period string, e.g. "1y"
+
+    Returns:
+        DataFrame indexed by date with one column per symbol
+    """
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(symbols))) as pool:
+        series = list(pool.map(lambda symbol: _close(symbol, period), symbols))
+    return pd.concat(series, axis=1).sort_index()
@@ -1,12 +1,16 @@
 import asyncio
 import json
+import re
 import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
-import yfinance as yf
 from utils.tool_decorator import tool
+from tools._backtest import BUY, SELL, sma_crossover_loop, rsi_loop, bollinger_loop
+from tools._indicators import ema, tail_mean
+from tools import _yf_cache as yf_cache
+from tools._cache import FileCache
 
 try:
     from sklearn.linear_model import LinearRegression
@@ -14,13 +18,24 @@ try:
 except ImportError:
     LinearRegression = None
 
+# Read-mostly upstream data, cached on disk across calls and restarts
+_INFO_CACHE = FileCache("stock_info", ttl=86400)
+_CRYPTO_CACHE = FileCache("crypto", ttl=600)
+_FORECAST_CACHE = FileCache("prophet", ttl=86400)
+
+# Headline sentiment keywords, matched as substrings of the lower-cased title
+BULLISH_KEYWORDS = ('surge', 'soar', 'jump', 'gain', 'rise', 'beat', 'upgrade', 'bullish', 'growth', 'profit', 'rally')
+BEARISH_KEYWORDS = ('fall', 'drop', 'plunge', 'crash', 'lose', 'downgrade', 'bearish', 'loss', 'concern', 'fear', 'warning')
+_BULLISH_RE = re.compile("|".join(map(re.escape, BULLISH_KEYWORDS)))
+_BEARISH_RE = re.compile("|".join(map(re.escape, BEARISH_KEYWORDS)))
+
 class FinancialTools:
     """
     FINANCIAL_TOOLS: Advanced market analysis, technical indicators, 
     forecasting, backtesting, and portfolio analytics.
     """
 
-    @tool()
+    @tool(parallel_safe=True)
     def get_stock_info(self, ticker: str) -> str:
         """
         Gets detailed stock information (P/E, market cap, sector, dividend, etc).
@@ -28,8 +43,12 @@ class FinancialTools:
         :param ticker: Stock symbol (e.g., 'AAPL', 'MSFT', 'TSLA')
         """
         try:
-            stock = yf.Ticker(ticker.strip().upper())
-            info = stock.info
+            symbol = ticker.strip().upper()
+            info = _INFO_CACHE.get(symbol)
+            if info is None:
+                info = yf_cache.ticker(symbol).info
+                if info and len(info) >= 5:
+                    _INFO_CACHE.set(symbol, info)
             
             if not info or len(info) < 5:
                 return f"No information found for '{ticker}'. Verify the ticker symbol."
@@ -63,7 +82,7 @@ class FinancialTools:
         except Exception as e:
             return f"Error fetching stock info: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def get_technical_indicators(self, ticker: str, period: str = "6mo") -> str:
         """
         Calculates technical indicators: SMA, EMA, RSI, MACD, Bollinger Bands.
@@ -73,60 +92,64 @@ class FinancialTools:
         """
         try:
             ticker = ticker.strip().upper()
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=period)
+            df = yf_cache.history(ticker, period)
             
             if df.empty:
                 return f"No data found for '{ticker}'"
 
-            close = df['Close']
-            high = df['High']
-            low = df['Low']
-            volume = df['Volume']
+            # Every indicator below only needs its trailing window, so the
+            # windowed ones read tail slices instead of building full rolling series
+            close = df['Close'].to_numpy(dtype=np.float64)
+            high = df['High'].to_numpy(dtype=np.float64)
+            low = df['Low'].to_numpy(dtype=np.float64)
+            n = close.size
             
             indicators = {}
             
             # SMA - Simple Moving Averages
-            indicators['SMA_20'] = close.rolling(window=20).mean().iloc[-1]
-            indicators['SMA_50'] = close.rolling(window=50).mean().iloc[-1]
-            indicators['SMA_200'] = close.rolling(window=200).mean().iloc[-1] if len(close) >= 200 else None
-            
-            # EMA - Exponential Moving Averages
-            indicators['EMA_12'] = close.ewm(span=12, adjust=False).mean().iloc[-1]
-            indicators['EMA_26'] = close.ewm(span=26, adjust=False).mean().iloc[-1]
-            
-            # RSI - Relative Strength Index
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            indicators['RSI_14'] = (100 - (100 / (1 + rs))).iloc[-1]
+            indicators['SMA_20'] = tail_mean(close, 20)
+            indicators['SMA_50'] = tail_mean(close, 50)
+            indicators['SMA_200'] = tail_mean(close, 200) if n >= 200 else None
+            
+            # EMA - Exponential Moving Averages (recursive: one full pass each)
+            ema_12 = ema(close, 12)
+            ema_26 = ema(close, 26)
+            indicators['EMA_12'] = ema_12[-1]
+            indicators['EMA_26'] = ema_26[-1]
+            
+            # RSI - Relative Strength Index (mean gain/loss of the last 14 changes)
+            indicators['RSI_14'] = np.nan
+            if n >= 14:
+                delta = np.diff(close[-15:])
+                gain = np.maximum(delta, 0).sum() / 14
+                loss = -np.minimum(delta, 0).sum() / 14
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    indicators['RSI_14'] = 100 - (100 / (1 + gain / loss))
             
             # MACD
-            ema_12 = close.ewm(span=12, adjust=False).mean()
-            ema_26 = close.ewm(span=26, adjust=False).mean()
             macd = ema_12 - ema_26
-            signal = macd.ewm(span=9, adjust=False).mean()
-            indicators['MACD'] = macd.iloc[-1]
-            indicators['MACD_Signal'] = signal.iloc[-1]
-            indicators['MACD_Histogram'] = (macd - signal).iloc[-1]
+            signal = ema(macd, 9)
+            indicators['MACD'] = macd[-1]
+            indicators['MACD_Signal'] = signal[-1]
+            indicators['MACD_Histogram'] = macd[-1] - signal[-1]
             
             # Bollinger Bands
-            sma_20 = close.rolling(window=20).mean()
-            std_20 = close.rolling(window=20).std()
-            indicators['BB_Upper'] = (sma_20 + (std_20 * 2)).iloc[-1]
-            indicators['BB_Middle'] = sma_20.iloc[-1]
-            indicators['BB_Lower'] = (sma_20 - (std_20 * 2)).iloc[-1]
-            
-            # Average True Range
-            high_low = high - low
-            high_close = np.abs(high - close.shift())
-            low_close = np.abs(low - close.shift())
-            tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            indicators['ATR_14'] = tr.rolling(14).mean().iloc[-1]
+            sma_20 = indicators['SMA_20']
+            std_20 = close[-20:].std(ddof=1) if n >= 20 else np.nan
+            indicators['BB_Upper'] = sma_20 + (std_20 * 2)
+            indicators['BB_Middle'] = sma_20
+            indicators['BB_Lower'] = sma_20 - (std_20 * 2)
+            
+            # Average True Range (the first bar has no previous close)
+            prev_close = close[-15:-1] if n >= 15 else np.concatenate(([np.nan], close[:-1]))
+            high_low = high[-14:] - low[-14:]
+            high_close = np.abs(high[-14:] - prev_close)
+            low_close = np.abs(low[-14:] - prev_close)
+            tr = np.fmax(high_low, np.fmax(high_close, low_close))
+            indicators['ATR_14'] = tr.mean() if n >= 14 else np.nan
             
             # Current price context
-            current_price = close.iloc[-1]
+            current_price = close[-1]
             
             result = f"## 📈 Technical Analysis: {ticker}\n"
             result += f"**Current Price:** ${current_price:.2f}\n"
@@ -179,7 +202,7 @@ class FinancialTools:
         except Exception as e:
             return f"Error calculating indicators: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def backtest_strategy(self, ticker: str, strategy: str = "sma_crossover", 
                           initial_capital: float = 10000, period: str = "2y") -> str:
         """
@@ -191,88 +214,46 @@ class FinancialTools:
         """
         try:
             ticker = ticker.strip().upper()
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=period)
+            df = yf_cache.history(ticker, period)
             
             if df.empty:
                 return f"No data found for '{ticker}'"
             
             close = df['Close']
-            trades = []
-            capital = initial_capital
-            shares = 0
-            position = None
+            close_np = close.to_numpy(dtype=np.float64)
+            capital = float(initial_capital)
+            labels = {BUY: 'BUY', SELL: 'SELL'}
+            notes = None
             
+            # Indicators stay vectorized in pandas; the bar-by-bar loops run in _backtest
             if strategy == "sma_crossover":
-                sma_short = close.rolling(window=20).mean()
-                sma_long = close.rolling(window=50).mean()
-                
-                for i in range(50, len(df)):
-                    if sma_short.iloc[i] > sma_long.iloc[i] and position != 'long':
-                        if position == 'short':
-                            capital = shares * close.iloc[i]
-                            shares = 0
-                            trades.append(('SELL', df.index[i], close.iloc[i], capital))
-                        shares = capital / close.iloc[i]
-                        capital = 0
-                        position = 'long'
-                        trades.append(('BUY', df.index[i], close.iloc[i], shares * close.iloc[i]))
-                    elif sma_short.iloc[i] < sma_long.iloc[i] and position == 'long':
-                        capital = shares * close.iloc[i]
-                        trades.append(('SELL', df.index[i], close.iloc[i], capital))
-                        shares = 0
-                        position = 'short'
-                
-                if position == 'long':
-                    capital = shares * close.iloc[-1]
+                sma_short = close.rolling(window=20).mean().to_numpy(dtype=np.float64)
+                sma_long = close.rolling(window=50).mean().to_numpy(dtype=np.float64)
+                capital, idx, side, price, value = sma_crossover_loop(close_np, sma_short, sma_long, capital, 50)
             
             elif strategy == "rsi_oversold":
                 delta = close.diff()
                 gain = delta.where(delta > 0, 0).rolling(14).mean()
                 loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-                rsi = 100 - (100 / (1 + (gain / loss)))
-                
-                for i in range(20, len(df)):
-                    if rsi.iloc[i] < 30 and position != 'long':
-                        if position == 'short':
-                            capital = shares * close.iloc[i]
-                            shares = 0
-                        shares = capital / close.iloc[i]
-                        capital = 0
-                        position = 'long'
-                        trades.append(('BUY', df.index[i], close.iloc[i], 'RSI oversold'))
-                    elif rsi.iloc[i] > 70 and position == 'long':
-                        capital = shares * close.iloc[i]
-                        trades.append(('SELL', df.index[i], close.iloc[i], 'RSI overbought'))
-                        shares = 0
-                        position = None
-                
-                if position == 'long':
-                    capital = shares * close.iloc[-1]
+                rsi = (100 - (100 / (1 + (gain / loss)))).to_numpy(dtype=np.float64)
+                capital, idx, side, price, value = rsi_loop(close_np, rsi, capital, 20)
+                notes = {BUY: 'RSI oversold', SELL: 'RSI overbought'}
             
             elif strategy == "bollinger_bounce":
                 sma = close.rolling(20).mean()
                 std = close.rolling(20).std()
-                bb_upper = sma + (std * 2)
-                bb_lower = sma - (std * 2)
-                
-                for i in range(20, len(df)):
-                    if close.iloc[i] < bb_lower.iloc[i] and position != 'long':
-                        if position == 'short':
-                            capital = shares * close.iloc[i]
-                            shares = 0
-                        shares = capital / close.iloc[i]
-                        capital = 0
-                        position = 'long'
-                        trades.append(('BUY', df.index[i], close.iloc[i], 'BB lower'))
-                    elif close.iloc[i] > bb_upper.iloc[i] and position == 'long':
-                        capital = shares * close.iloc[i]
-                        trades.append(('SELL', df.index[i], close.iloc[i], 'BB upper'))
-                        shares = 0
-                        position = None
-                
-                if position == 'long':
-                    capital = shares * close.iloc[-1]
+                bb_upper = (sma + (std * 2)).to_numpy(dtype=np.float64)
+                bb_lower = (sma - (std * 2)).to_numpy(dtype=np.float64)
+                capital, idx, side, price, value = bollinger_loop(close_np, bb_upper, bb_lower, capital, 20)
+                notes = {BUY: 'BB lower', SELL: 'BB upper'}
+            
+            else:
+                idx = side = price = value = np.empty(0)
+            
+            trades = [
+                (labels[s], df.index[i], p, notes[s] if notes else v)
+                for i, s, p, v in zip(idx.tolist(), side.tolist(), price.tolist(), value.tolist())
+            ]
             
             total_return = ((capital - initial_capital) / initial_capital) * 100
             num_trades = len(trades)
@@ -295,21 +276,15 @@ class FinancialTools:
             
             # Calculate max drawdown
             if len(trades) > 0:
-                equity_curve = [initial_capital]
-                for trade in trades:
-                    if trade[0] == 'BUY':
-                        equity_curve.append(equity_curve[-1])
-                    else:
-                        equity_curve.append(trade[2])
+                # Equity marks at each sell price; buys carry the previous mark forward
+                equity_curve = np.empty(len(trades) + 1)
+                equity_curve[0] = initial_capital
+                equity_curve[1:] = np.where(side == SELL, price, np.nan)
+                marked = np.where(np.isnan(equity_curve), 0, np.arange(equity_curve.size))
+                equity_curve = equity_curve[np.maximum.accumulate(marked)]
                 
-                peak = equity_curve[0]
-                max_dd = 0
-                for eq in equity_curve:
-                    if eq > peak:
-                        peak = eq
-                    dd = (peak - eq) / peak
-                    if dd > max_dd:
-                        max_dd = dd
+                peak = np.maximum.accumulate(equity_curve)
+                max_dd = max(0.0, ((peak - equity_curve) / peak).max())
                 
                 result += f"\n**Max Drawdown:** {max_dd*100:.2f}%\n"
             
@@ -318,7 +293,7 @@ class FinancialTools:
         except Exception as e:
             return f"Error running backtest: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def forecast_price(self, ticker: str, days: int = 30, period: str = "2y") -> str:
         """
         Advanced Time Series Forecast using Facebook Prophet.
@@ -328,15 +303,16 @@ class FinancialTools:
         :param period: Historical data period (default 2y for robust training)
         """
         try:
+            import prophet
             from prophet import Prophet
+            from prophet.serialize import model_to_json, model_from_json
             from sklearn.metrics import mean_absolute_percentage_error
         except ImportError:
             return "Error: prophet and scikit-learn are required for advanced forecasting. Install with: pip install prophet scikit-learn"
         
         try:
             ticker = ticker.strip().upper()
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=period)
+            df = yf_cache.history(ticker, period)
             
             if df.empty or len(df) < 100:
                 return f"Insufficient historical data for '{ticker}' to train Prophet. Need at least 100 days."
@@ -347,29 +323,46 @@ class FinancialTools:
             df['Date'] = df['Date'].dt.tz_localize(None) 
             prophet_df = df[['Date', 'Close']].rename(columns={'Date': 'ds', 'Close': 'y'})
             
-            # 1. EVALUATION (Train/Test Split)
             # We withhold the last 30 days to measure real model accuracy
             test_days = min(30, int(len(prophet_df) * 0.1))
-            train = prophet_df.iloc[:-test_days]
-            test = prophet_df.iloc[-test_days:]
-            
-            eval_model = Prophet(daily_seasonality=False, yearly_seasonality=True)
-            eval_model.fit(train)
             
-            future_test = eval_model.make_future_dataframe(periods=test_days)
-            forecast_test = eval_model.predict(future_test)
-            
-            # Extract predictions for the test period
-            predictions = forecast_test['yhat'].iloc[-test_days:].values
-            actuals = test['y'].values
-            
-            # Calculate MAPE (Mean Absolute Percentage Error)
-            mape = mean_absolute_percentage_error(actuals, predictions) * 100
-            
-            # 2. ACTUAL FUTURE FORECAST
-            # Now train on ALL data to forecast the unknown future
-            final_model = Prophet(daily_seasonality=False, yearly_seasonality=True)
-            final_model.fit(prophet_df)
+            # The fitted model and its MAPE are reused for a day, across forecast horizons.
+            # The last training date is part of the key, so a new bar means a refit.
+            fit_key = (ticker, period, str(prophet_df['ds'].iloc[-1].date()))
+            cached_fit = _FORECAST_CACHE.get(fit_key)
+            if cached_fit is not None and cached_fit.get("version") != prophet.__version__:
+                cached_fit = None
+            if cached_fit is not None:
+                final_model = model_from_json(cached_fit["model"])
+                mape = cached_fit["mape"]
+            else:
+                # 1. EVALUATION (Train/Test Split)
+                train = prophet_df.iloc[:-test_days]
+                test = prophet_df.iloc[-test_days:]
+                
+                eval_model = Prophet(daily_seasonality=False, yearly_seasonality=True)
+                eval_model.fit(train)
+                
+                future_test = eval_model.make_future_dataframe(periods=test_days)
+                forecast_test = eval_model.predict(future_test)
+                
+                # Extract predictions for the test period
+                predictions = forecast_test['yhat'].iloc[-test_days:].values
+                actuals = test['y'].values
+                
+                # Calculate MAPE (Mean Absolute Percentage Error)
+                mape = mean_absolute_percentage_error(actuals, predictions) * 100
+                
+                # 2. ACTUAL FUTURE FORECAST
+                # Now train on ALL data to forecast the unknown future
+                final_model = Prophet(daily_seasonality=False, yearly_seasonality=True)
+                final_model.fit(prophet_df)
+                
+                _FORECAST_CACHE.set(fit_key, {
+                    "model": model_to_json(final_model),
+                    "mape": mape,
+                    "version": prophet.__version__,
+                })
             
             future_final = final_model.make_future_dataframe(periods=days)
             # Exclude weekends from future dataframe for stock markets
@@ -421,7 +414,7 @@ class FinancialTools:
         except Exception as e:
             return f"Error forecasting with Prophet: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def get_portfolio_metrics(self, tickers: str, weights: Optional[str] = None) -> str:
         """
         Calculates portfolio metrics: Sharpe ratio, volatility, max drawdown.
@@ -440,7 +433,7 @@ class FinancialTools:
                 weight_list = [1.0/len(ticker_list)] * len(ticker_list)
             
             # Fetch data
-            data = yf.download(ticker_list, period="1y", progress=False)['Close']
+            data = yf_cache.closes(ticker_list, "1y")
             
             if data.empty:
                 return "No data available for provided tickers"
@@ -463,10 +456,10 @@ class FinancialTools:
             sharpe_ratio = (annualized_return - 0.05) / annualized_vol  # Assuming 5% risk-free rate
             
             # Cumulative returns
-            cumulative = (1 + portfolio_returns).cumprod()
-            running_max = cumulative.cummax()
+            cumulative = (1 + portfolio_returns).cumprod().to_numpy()
+            running_max = np.maximum.accumulate(cumulative, axis=0)
             drawdown = (cumulative - running_max) / running_max
-            max_drawdown = drawdown.min() * 100
+            max_drawdown = drawdown.min() * 100 if drawdown.size else np.nan
             
             # VaR 95%
             var_95 = portfolio_returns.quantile(0.05) * 100
@@ -501,7 +494,7 @@ class FinancialTools:
         except Exception as e:
             return f"Error calculating portfolio metrics: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     async def get_sentiment_analysis(self, ticker: str, max_results: int = 10) -> str:
         """
         Analyzes news sentiment for a stock using web scraping.
@@ -512,13 +505,13 @@ class FinancialTools:
             ticker = ticker.strip().upper()
             
             # Fetch news via yfinance
-            stock = yf.Ticker(ticker)
+            stock = yf_cache.ticker(ticker)
             news = stock.news
             
             if not news:
                 # Fallback: search for news
-                from core.scraper import LLMFriendlyScraper
-                scraper = LLMFriendlyScraper()
+                from core.scraper import get_scraper
+                scraper = get_scraper()
                 search_url = f"https://news.google.com/search?q={ticker}+stock+news"
                 
                 result = f"## 📰 Sentiment Analysis: {ticker}\n"
@@ -538,18 +531,16 @@ class FinancialTools:
             # Analyze sentiment
             headlines = [n.get('title', '') for n in news[:max_results] if n.get('title')]
             
-            # Simple keyword-based sentiment
-            bullish_keywords = ['surge', 'soar', 'jump', 'gain', 'rise', 'beat', 'upgrade', 'bullish', 'growth', 'profit', 'rally']
-            bearish_keywords = ['fall', 'drop', 'plunge', 'crash', 'lose', 'downgrade', 'bearish', 'loss', 'concern', 'fear', 'warning']
-            
+            # Simple keyword-based sentiment: one regex pass per polarity,
+            # scoring each distinct keyword found once
             bullish_count = 0
             bearish_count = 0
             neutral_count = 0
             
             for headline in headlines:
                 head_lower = headline.lower()
-                bull = sum(1 for kw in bullish_keywords if kw in head_lower)
-                bear = sum(1 for kw in bearish_keywords if kw in head_lower)
+                bull = len(set(_BULLISH_RE.findall(head_lower)))
+                bear = len(set(_BEARISH_RE.findall(head_lower)))
                 
                 if bull > bear:
                     bullish_count += 1
@@ -587,8 +578,8 @@ class FinancialTools:
         except Exception as e:
             return f"Error analyzing sentiment: {str(e)}"
 
-    @tool()
-    def get_crypto_data(self, crypto: str, vs_currency: str = "usd", days: int = 30) -> str:
+    @tool(parallel_safe=True)
+    async def get_crypto_data(self, crypto: str, vs_currency: str = "usd", days: int = 30) -> str:
         """
         Gets cryptocurrency data from CoinGecko API (free, no API key needed).
         :param crypto: Crypto symbol (e.g., 'bitcoin', 'ethereum', 'solana')
@@ -620,12 +611,18 @@ class FinancialTools:
             url = f"https://api.coingecko.com/api/v3/coins/{crypto_id}/market_chart"
             params = {'vs_currency': vs_currency, 'days': days}
             
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                return f"CoinGecko API error: {response.status_code}"
-            
-            data = response.json()
+            cache_key = (crypto_id, vs_currency, days)
+            data = _CRYPTO_CACHE.get(cache_key)
+            if data is None:
+                # Off the event loop, so concurrent tools keep running during the request
+                response = await asyncio.to_thread(requests.get, url, params=params, timeout=10)
+                
+                if response.status_code != 200:
+                    return f"CoinGecko API error: {response.status_code}"
+                
+                data = response.json()
+                if 'prices' in data:
+                    _CRYPTO_CACHE.set(cache_key, data)
             
             if 'prices' not in data:
                 return f"Crypto '{crypto}' not found"
@@ -634,12 +631,17 @@ class FinancialTools:
             market_caps = data['market_caps']
             volumes = data['total_volumes']
             
-            # Convert to DataFrame
-            df = pd.DataFrame(prices, columns=['timestamp', 'price'])
-            df['market_cap'] = [m[1] for m in market_caps]
-            df['volume'] = [v[1] for v in volumes]
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            # Convert to DataFrame (columns straight from the [timestamp, value] pairs)
+            prices = np.asarray(prices, dtype=np.float64)
+            df = pd.DataFrame(
+                {
+                    'price': prices[:, 1],
+                    'market_cap': np.asarray(market_caps, dtype=np.float64)[:, 1],
+                    'volume': np.asarray(volumes, dtype=np.float64)[:, 1],
+                },
+                index=pd.to_datetime(prices[:, 0], unit='ms'),
+            )
+            df.index.name = 'timestamp'
             
             # Current values
             current_price = df['price'].iloc[-1]
@@ -683,7 +685,7 @@ class FinancialTools:
         except Exception as e:
             return f"Error fetching crypto data: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def get_economic_calendar(self, days: int = 7) -> str:
         """
         Gets upcoming economic events and earnings.
@@ -697,8 +699,7 @@ class FinancialTools:
             index_data = []
             
             for idx in indices:
-                stock = yf.Ticker(idx)
-                hist = stock.history(period="2d")
+                hist = yf_cache.history(idx, "2d")
                 if len(hist) >= 2:
                     change = ((hist['Close'].iloc[-1] - hist['Close'].iloc[-2]) / hist['Close'].iloc[-2]) * 100
                     name = {'^GSPC': 'S&P 500', '^DJI': 'Dow Jones', '^IXIC': 'Nasdaq'}[idx]
@@ -749,7 +750,7 @@ class FinancialTools:
         except Exception as e:
             return f"Error fetching economic calendar: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def compare_stocks(self, tickers: str, period: str = "1y") -> str:
         """
         Compares multiple stocks side by side.
@@ -762,7 +763,7 @@ class FinancialTools:
             if len(ticker_list) > 5:
                 return "Maximum 5 tickers for comparison"
             
-            data = yf.download(ticker_list, period=period, progress=False)['Close']
+            data = yf_cache.closes(ticker_list, period)
             
             if data.empty:
                 return "No data available"
@@ -6,9 +6,9 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
-from core.scraper import LLMFriendlyScraper
-import yfinance as yf
+from core.scraper import get_scraper
 from utils.tool_decorator import tool
+from tools import _yf_cache as yf_cache
 
 try:
     import arxiv
@@ -18,7 +18,7 @@ except ImportError:
     arxiv = None
 
 class NavigationTools:
-    @tool()
+    @tool(parallel_safe=True)
     async def web_search_general(self, query: str) -> str:
         """
         DEFAULT SEARCH TOOL. Use this for ANY question about the real world:
@@ -65,7 +65,7 @@ class NavigationTools:
             # Scraping profundo
             if urls_to_scrape:
                 try:
-                    scraper = LLMFriendlyScraper()
+                    scraper = get_scraper()
                     scraped_pages = await scraper.scrape_multiple(urls_to_scrape, max_urls=3,max_concurrent=3)
                     
                     if scraped_pages:
@@ -88,7 +88,7 @@ class NavigationTools:
         except Exception as e:
             return f"Search Error: {str(e)[:100]}"
     
-    @tool()
+    @tool(parallel_safe=True)
     async def scrape_url(self, url: str) -> str:
         """
         Reads and extracts text content from a specific URL.
@@ -120,7 +120,7 @@ class NavigationTools:
         except Exception as e:
             return f"HTTP Fallback Error: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def arxiv_research(self, query: str, max_results: int = 5) -> str:
         """
         Searches arXiv for academic papers. ONLY use when user explicitly says 'arxiv', 'avix', 'papers', or 'scientific papers'.
@@ -152,7 +152,7 @@ class NavigationTools:
         except Exception as e:
             return f"Error searching arXiv: {str(e)}"
 
-    @tool()
+    @tool(parallel_safe=True)
     def stock_data(self, ticker: str, period: str = "1y") -> str:
         """
         Gets REAL stock market data (prices, volume) for any company.
@@ -163,8 +163,8 @@ class NavigationTools:
         """
         try:
             ticker = ticker.strip().upper()
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=period)
+            stock = yf_cache.ticker(ticker)
+            df = yf_cache.history(ticker, period)
             
             if df.empty:
                 return f"No data found for ticker '{ticker}'. Verify the symbol is correct (e.g., 'KO' for Coca-Cola, 'AAPL' for Apple)."
@@ -1,11 +1,36 @@
 # utils/tool_decorator.py
 
-def tool():
+class _ToolMarker:
+    """
+    Class-body placeholder returned by @tool(). When the class is created,
+    __set_name__ puts the plain function back and records its name in the
+    owner's `__tools__` list, so registration never has to scan attributes.
+    """
+    def __init__(self, func):
+        self.func = func
+
+    def __set_name__(self, owner, name):
+        setattr(owner, name, self.func)
+        if "__tools__" not in owner.__dict__:
+            # Start from the tools inherited from base classes
+            owner.__tools__ = list(getattr(owner, "__tools__", ()))
+        owner.__tools__.append(name)
+
+
+def tool(parallel_safe: bool = False):
     """
     Decorator to mark a method as a tool.
-    Adds a `_is_tool = True` attribute to the method.
+    Adds a `_is_tool = True` attribute to the method and lists its name in
+    the class's `__tools__`.
+    
+    Args:
+        parallel_safe: The tool only reads (web, scraping, market data), so the
+            executor may run it concurrently with neighbouring parallel-safe
+            steps. Tools with side effects keep the default and run alone, in
+            plan order.
     """
     def decorator(func):
         func._is_tool = True
-        return func
+        func._parallel_safe = parallel_safe
+        return _ToolMarker(func)
     return decorator